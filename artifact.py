@@ -0,0 +1,159 @@
+"""Compact, memory-mappable model artifact.
+
+Build it after (re)training, next to the pickles it was exported from:
+
+    python artifact.py build
+    python artifact.py check --samples 20000
+
+Layout (little-endian):
+
+    b"PPDMODEL" | u32 format | u32 header length | JSON header | payload
+
+The JSON header holds the model version, the support categories, the
+labels and, per array, its dtype, shape and offset into the payload, plus a
+SHA-256 of the payload. The header is padded so every array starts on a
+64-byte boundary. Arrays are already folded for ``CompiledScorer``, so
+loading is a read-only ``np.memmap`` with no copies and no pickle: every
+process that maps the same file shares one physical copy of the weights.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from scorer import CompiledScorer, bundle_arrays, check_parity, fold_scaler
+
+ARTIFACT_PATH = "ppd_model.ppdm"
+MAGIC = b"PPDMODEL"
+FORMAT_VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct("<II")
+_HEADER_START = len(MAGIC) + _PREFIX.size
+
+
+def _padding(size):
+    return -size % ALIGN
+
+
+def export_artifact(model, le, version, path=ARTIFACT_PATH):
+    """Writes the folded pipeline weights and label classes as a versioned artifact."""
+    arrays = fold_scaler(bundle_arrays(model, le, version))
+    numeric = {key: np.ascontiguousarray(val) for key, val in arrays.items()
+               if key not in ("version", "support_categories", "labels", "n_layers")}
+
+    specs = {}
+    chunks = []
+    offset = 0
+    for name, array in numeric.items():
+        if array.dtype.kind not in "iuf":
+            raise ValueError(f"{name}: unsupported dtype {array.dtype}")
+        array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        specs[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        data = array.tobytes()
+        chunks.append(data + b"\0" * _padding(len(data)))
+        offset += len(chunks[-1])
+    payload = b"".join(chunks)
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "model_version": version,
+        "support_categories": [str(c) for c in arrays["support_categories"]],
+        "labels": [str(label) for label in arrays["labels"]],
+        "n_layers": int(arrays["n_layers"]),
+        "arrays": specs,
+        "payload_bytes": len(payload),
+        "payload_sha256": hashlib.sha256(payload).hexdigest(),
+    }, separators=(",", ":")).encode()
+    header += b" " * _padding(_HEADER_START + len(header))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_PREFIX.pack(FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class ModelArtifact:
+    """Read-only, memory-mapped view of an exported artifact.
+
+    Raises ValueError if the file is not an artifact, has an unsupported
+    format or fails its checksum.
+    """
+
+    def __init__(self, path=ARTIFACT_PATH, verify=True):
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(raw) < _HEADER_START or bytes(raw[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path}: not a model artifact")
+        fmt, header_len = _PREFIX.unpack(bytes(raw[len(MAGIC):_HEADER_START]))
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported artifact format {fmt}")
+        header = json.loads(bytes(raw[_HEADER_START:_HEADER_START + header_len]))
+        start = _HEADER_START + header_len
+        payload = raw[start:start + header["payload_bytes"]]
+        if len(payload) != header["payload_bytes"]:
+            raise ValueError(f"{path}: truncated artifact")
+        if verify and hashlib.sha256(payload).hexdigest() != header["payload_sha256"]:
+            raise ValueError(f"{path}: checksum mismatch")
+
+        self.path = path
+        self.version = header["model_version"]
+        self.header = header
+        self.arrays = {name: np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=raw,
+                                        offset=start + spec["offset"])
+                       for name, spec in header["arrays"].items()}
+
+    @classmethod
+    def load_if_current(cls, version, path=ARTIFACT_PATH):
+        """Returns the artifact only if it was exported from the given model version."""
+        if not os.path.exists(path):
+            return None
+        artifact = cls(path)
+        return artifact if artifact.version == version else None
+
+    def scorer(self):
+        """A CompiledScorer running directly on the mapped weights."""
+        return CompiledScorer({
+            **self.arrays,
+            "version": self.version,
+            "support_categories": self.header["support_categories"],
+            "labels": np.array(self.header["labels"]),
+            "n_layers": self.header["n_layers"],
+        })
+
+
+def main():
+    from model_registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Build or verify the memory-mapped model artifact.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--output", default=ARTIFACT_PATH)
+    parser.add_argument("--samples", type=int, default=10000)
+    args = parser.parse_args()
+
+    handle = ModelRegistry(use_compiled=False).current()
+    if args.command == "build":
+        export_artifact(handle.model, handle.le, handle.version, args.output)
+        print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes) for model version {handle.version}")
+
+    started = time.perf_counter()
+    artifact = ModelArtifact(args.output)
+    scorer = artifact.scorer()
+    print(f"Loaded in {(time.perf_counter() - started) * 1000:.2f} ms (model version {artifact.version})")
+    if artifact.version != handle.version:
+        print(f"Stale artifact: the pickles are model version {handle.version}")
+        raise SystemExit(1)
+
+    mismatches, proba_gap = check_parity(handle.model, scorer, args.samples)
+    print(f"max |predict_proba| difference: {proba_gap:.2e}")
+    print(f"{mismatches} mismatches against model.predict")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Content-hashed static assets with pre-encoded WebP variants.
+
+Encode the variants once at build/deploy time so replicas start warm:
+
+    python assets.py
+
+A replica that finds a variant missing still serves the original and
+encodes the variant on a background thread instead of in the first render.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+STATIC_DIR = APP_DIR / "static"
+# Streamlit serves ./static/<file> at app/static/<file> when
+# server.enableStaticServing is on (see .streamlit/config.toml).
+STATIC_URL = "app/static"
+
+# Widest variant worth sending per image: the background covers the whole
+# window at its native 1536px; the sidebar is ~350 CSS px, so 720 covers 2x screens.
+ASSET_WIDTHS = {"background.png": 1536, "PM.png": 720}
+
+logger = logging.getLogger(__name__)
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+class Asset:
+    """A published static file: the original plus any downscaled variants."""
+
+    def __init__(self, url, variants):
+        self.url = url
+        self.variants = variants
+
+    def css_background(self):
+        """Returns background-image declarations, preferring the WebP variant."""
+        css = f"background-image: url('{self.url}');"
+        if "webp" in self.variants:
+            css += (f" background-image: image-set(url('{self.variants['webp']}') type('image/webp'),"
+                    f" url('{self.url}') type('image/png'));")
+        return css
+
+
+def _versioned_url(filename, digest):
+    # Tornado's StaticFileHandler sends a ten-year Cache-Control for any
+    # request carrying ?v=, and the content hash in the name keeps it safe.
+    return f"{STATIC_URL}/{filename}?v={digest}"
+
+
+def _atomic_write(dest, write):
+    # Several server processes may publish at once; never expose a partial file.
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, dest)
+
+
+def _write_webp(src, dest, max_width):
+    try:
+        from PIL import Image
+    except ImportError:
+        return False
+
+    def write(tmp):
+        with Image.open(src) as img:
+            if img.width > max_width:
+                img = img.resize((max_width, round(img.height * max_width / img.width)))
+            img.save(tmp, format="WEBP", quality=80, method=6)
+
+    _atomic_write(dest, write)
+    return True
+
+
+def _encode_in_background(src, dest, max_width):
+    with _pending_lock:
+        if dest in _pending:
+            return
+        _pending.add(dest)
+
+    def run():
+        try:
+            _write_webp(src, dest, max_width)
+        except Exception:
+            logger.exception("assets: failed to encode %s", dest.name)
+        finally:
+            with _pending_lock:
+                _pending.discard(dest)
+
+    threading.Thread(target=run, name=f"encode-{dest.name}", daemon=True).start()
+
+
+def publish_asset(src, max_width=None, encode_missing="background"):
+    """Copies src into the static folder under a content-hashed name.
+
+    Files already published under the same hash are reused. A missing WebP
+    variant is encoded on a background thread ("background"), right away
+    ("now") or not at all (None); until it exists only the original is
+    referenced. Returns None if the source file is missing.
+    """
+    src = APP_DIR / src
+    if not src.exists():
+        return None
+    max_width = max_width or ASSET_WIDTHS.get(src.name, 1920)
+    digest = hashlib.sha256(src.read_bytes()).hexdigest()[:10]
+    STATIC_DIR.mkdir(exist_ok=True)
+
+    hashed_name = f"{src.stem}.{digest}{src.suffix}"
+    if not (STATIC_DIR / hashed_name).exists():
+        _atomic_write(STATIC_DIR / hashed_name, lambda tmp: shutil.copyfile(src, tmp))
+
+    variants = {}
+    webp_path = STATIC_DIR / f"{src.stem}.{digest}.w{max_width}.webp"
+    if not webp_path.exists():
+        if encode_missing == "now":
+            _write_webp(src, webp_path, max_width)
+        elif encode_missing == "background":
+            _encode_in_background(src, webp_path, max_width)
+    if webp_path.exists():
+        variants["webp"] = _versioned_url(webp_path.name, digest)
+
+    return Asset(_versioned_url(hashed_name, digest), variants)
+
+
+if __name__ == "__main__":
+    for name in ASSET_WIDTHS:
+        asset = publish_asset(name, encode_missing="now")
+        print(f"{name}: {asset.variants.get('webp', 'no WebP variant (Pillow missing?)') if asset else 'missing'}")
@@ -0,0 +1,221 @@
+"""Score clinic exports of paper EPDS forms in bulk.
+
+    python batch_score.py forms.csv scored.csv
+    python batch_score.py forms.parquet scored.parquet --workers 8 --chunk-size 100000
+
+Input needs Age, FamilySupport and Q1-Q10 columns (any others, e.g. Name or
+Place, are passed through as text). EPDS_Score is always recomputed from Q1-Q10.
+Rows with a blank or out-of-range value are not scored; their ``error``
+column says why. Chunks are scored in a process pool with a bounded number
+in flight, so memory stays flat however large the file is. The output only
+appears under its final name once every chunk has been written.
+
+Parquet input/output needs pyarrow (pip install pyarrow).
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from content import AGE_MAX, AGE_MIN, SUPPORT_LEVELS
+from model_registry import ENCODER_PATH, FEATURE_COLUMNS, MODEL_PATH, QUESTION_COLUMNS
+
+REQUIRED_COLUMNS = ["Age", "FamilySupport", *QUESTION_COLUMNS]
+
+_worker_model = None
+_worker_le = None
+
+
+def _init_worker(model_path, encoder_path):
+    global _worker_model, _worker_le
+    import joblib
+    _worker_model = joblib.load(model_path)
+    _worker_le = joblib.load(encoder_path)
+
+
+def _whole_numbers(series):
+    """Numeric values as nullable integers; blanks, text and fractions become NA."""
+    values = pd.to_numeric(series, errors="coerce")
+    return values.where(values % 1 == 0).astype("Int64")
+
+
+def validate_frame(df):
+    """Coerces the input columns and returns (df, per-row error message, "" when valid)."""
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    df = df.copy()
+    errors = pd.Series("", index=df.index, dtype="string")
+
+    def flag(bad, message):
+        bad = bad.fillna(True).astype(bool)
+        errors[bad] = errors[bad] + message + "; "
+
+    df["Age"] = _whole_numbers(df["Age"])
+    flag(~df["Age"].between(AGE_MIN, AGE_MAX), f"Age must be a whole number from {AGE_MIN} to {AGE_MAX}")
+    # Transcribed forms vary in case and spacing; anything else is not a known level.
+    df["FamilySupport"] = df["FamilySupport"].astype("string").str.strip().str.capitalize()
+    flag(~df["FamilySupport"].isin(SUPPORT_LEVELS), f"FamilySupport must be one of {', '.join(SUPPORT_LEVELS)}")
+    for col in QUESTION_COLUMNS:
+        df[col] = _whole_numbers(df[col])
+        flag(~df[col].between(0, 3), f"{col} must be 0-3")
+    return df, errors.str.removesuffix("; ")
+
+
+def score_frame(df, model, le):
+    """Adds EPDS_Score, pred_encoded, risk_level, proba_<label> and error columns.
+
+    Invalid rows are kept, unscored, with the reason in ``error``.
+    """
+    df, errors = validate_frame(df)
+    valid = (errors == "").to_numpy()
+    df["EPDS_Score"] = df[QUESTION_COLUMNS].sum(axis=1).where(valid).astype("Int64")
+
+    labels = le.inverse_transform(model.classes_)
+    pred_encoded = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    risk_level = pd.Series(pd.NA, index=df.index, dtype="string")
+    proba = np.full((len(df), len(labels)), np.nan)
+    if valid.any():
+        rows = df.loc[valid, FEATURE_COLUMNS].astype({col: "int64" for col in ["Age", *QUESTION_COLUMNS,
+                                                                              "EPDS_Score"]})
+        rows["FamilySupport"] = rows["FamilySupport"].astype(object)
+        proba[valid] = model.predict_proba(rows)
+        best = proba[valid].argmax(axis=1)
+        pred_encoded[valid] = model.classes_[best]
+        risk_level[valid] = labels[best]
+    df["pred_encoded"] = pred_encoded
+    df["risk_level"] = risk_level
+    for i, label in enumerate(labels):
+        df[f"proba_{label}"] = proba[:, i]
+    df["error"] = errors
+    return df
+
+
+def _score_chunk(df):
+    return score_frame(df, _worker_model, _worker_le)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow, which is optional: pip install pyarrow") from None
+
+
+def read_chunks(path, chunk_size):
+    """Yields DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if path.endswith(".parquet"):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Read as text so a column that is blank in one chunk and filled in the
+        # next keeps one type; validate_frame coerces the scored columns itself.
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file, moved into place by ``commit``."""
+
+    def __init__(self, path):
+        self.final_path = path
+        self.path = f"{path}.partial"
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            _require_pyarrow()
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                # A column with no values in the first chunk has no type yet; store it as text.
+                schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                    for field in table.schema], metadata=table.schema.metadata)
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def commit(self):
+        self.close()
+        if self._first:
+            open(self.path, 'w').close()
+        os.replace(self.path, self.final_path)
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def score_file(input_path, output_path, chunk_size=50000, workers=None, model_path=MODEL_PATH,
+               encoder_path=ENCODER_PATH):
+    """Streams input_path through the pool into output_path, keeping row order."""
+    workers = workers or os.cpu_count() or 1
+    writer = ChunkWriter(output_path)
+    pending = deque()
+    rows = rejected = 0
+    started = time.perf_counter()
+
+    def drain_one():
+        nonlocal rows, rejected
+        scored = pending.popleft().result()
+        writer.write(scored)
+        rows += len(scored)
+        rejected += int((scored["error"] != "").sum())
+        elapsed = time.perf_counter() - started
+        print(f"\r{rows:,} rows  {rows / elapsed:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(model_path, encoder_path)) as pool:
+            for chunk in read_chunks(input_path, chunk_size):
+                pending.append(pool.submit(_score_chunk, chunk))
+                # At most two chunks per worker in memory at once.
+                if len(pending) >= 2 * workers:
+                    drain_one()
+            while pending:
+                drain_one()
+    except BaseException:
+        writer.discard()
+        raise
+    finally:
+        print(file=sys.stderr)
+    writer.commit()
+    return rows, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-score EPDS forms from a CSV or Parquet file.")
+    parser.add_argument("input", help="CSV or .parquet file with Age, FamilySupport and Q1-Q10")
+    parser.add_argument("output", help="CSV or .parquet file to write")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows, rejected = score_file(args.input, args.output, args.chunk_size, args.workers)
+    print(f"Scored {rows - rejected:,} of {rows:,} rows in {time.perf_counter() - started:.1f}s -> {args.output}",
+          file=sys.stderr)
+    if rejected:
+        print(f"{rejected:,} rows were not scored; see their 'error' column", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Concurrent-session load generator for the Streamlit app.
+
+    python benchmarks/load_test.py --levels 1,5,10,25,50 --think-time 1.0
+    python benchmarks/load_test.py --url http://localhost:8501 --server-pid 1234 --output load.json
+
+Starts ``streamlit run app.py`` locally (unless --url is given) and, for each
+concurrency level N, opens N websocket sessions that each complete the
+whole questionnaire flow the way a browser would: HOME, START TEST, the
+details form, Q1-Q10 and the PDF report, pausing --think-time seconds
+(+/- 50%) between clicks. Sessions stay connected until the level ends so
+their server-side state is still resident when memory is sampled.
+The local server writes its screenings to a temporary PPD_DATA_DIR that is
+deleted afterwards, never to the real stores.
+
+Per level it reports throughput, p50/p95/p99 rerun latency and the growth
+of the server's resident memory divided by N (Linux /proc only).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+FINISHED_STATUSES = {"FINISHED_SUCCESSFULLY", "FINISHED_FRAGMENT_RUN_SUCCESSFULLY", "FINISHED_WITH_COMPILE_ERROR"}
+WIDGET_TYPES = {"button", "radio", "text_input", "slider", "selectbox"}
+
+
+class AppSession:
+    """A minimal browser stand-in speaking Streamlit's websocket protocol."""
+
+    def __init__(self, url):
+        self.ws_url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.conn = None
+        self.widgets = {}
+        self.values = {}
+        self.cache = {}
+        self.latencies = []
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.conn = await websocket_connect(self.ws_url, subprotocols=["streamlit"], max_message_size=64 << 20)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    def _track(self, msg):
+        delta = msg.delta
+        if delta.WhichOneof("type") != "new_element":
+            return
+        kind = delta.new_element.WhichOneof("type")
+        if kind in WIDGET_TYPES:
+            element = getattr(delta.new_element, kind)
+            self.widgets[(kind, element.label)] = (element, delta.fragment_id)
+
+    def find(self, kind, label_prefix):
+        for (widget_kind, label), widget in reversed(list(self.widgets.items())):
+            if widget_kind == kind and label.startswith(label_prefix):
+                return widget
+        raise LookupError(f"No {kind} labelled {label_prefix!r} on the page")
+
+    async def rerun(self, trigger=None, fragment_id=""):
+        """Sends one rerun with the current widget values; waits for the script to finish."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.page_script_hash = ""
+        if fragment_id:
+            back.rerun_script.fragment_id = fragment_id
+        states = back.rerun_script.widget_states.widgets
+        for state in self.values.values():
+            states.add().CopyFrom(state)
+        if trigger is not None:
+            states.add(id=trigger, trigger_value=True)
+
+        if not fragment_id:
+            self.widgets.clear()
+        started = time.perf_counter()
+        await self.conn.write_message(back.SerializeToString(), binary=True)
+        while True:
+            raw = await self.conn.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the session")
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            kind = msg.WhichOneof("type")
+            if kind == "ref_hash":
+                msg = self.cache[msg.ref_hash]
+                kind = msg.WhichOneof("type")
+            elif msg.hash:
+                self.cache[msg.hash] = msg
+            if kind == "delta":
+                self._track(msg)
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished)
+                if status in FINISHED_STATUSES:
+                    break
+        self.latencies.append((time.perf_counter() - started) * 1000)
+
+    def set_value(self, kind, label, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        element, _ = self.find(kind, label)
+        state = WidgetState(id=element.id)
+        if kind == "text_input":
+            state.string_value = value
+        elif kind == "slider":
+            state.double_array_value.data[:] = [value]
+        else:
+            # Radio and selectbox state is the chosen option's label.
+            state.string_value = value
+        self.values[element.id] = state
+
+    async def click(self, label):
+        element, fragment_id = self.find("button", label)
+        await self.rerun(trigger=element.id, fragment_id=fragment_id)
+
+
+async def complete_flow(session, think_time):
+    """One mother's full visit, ending on the result screen with the PDF prepared."""
+    async def think():
+        await asyncio.sleep(think_time * random.uniform(0.5, 1.5))
+
+    await session.connect()
+    await session.rerun()
+    await think()
+    await session.click("START TEST")
+    await think()
+    session.set_value("text_input", "First Name", "Load")
+    session.set_value("text_input", "Your Place", random.choice(["Kochi", "Pune", "Delhi"]))
+    session.set_value("slider", "Your Age", random.randint(18, 45))
+    session.set_value("selectbox", "Level of Family Support", random.choice(["High", "Medium", "Low"]))
+    await session.click("Start Questionnaire")
+    for q in range(1, 11):
+        await think()
+        element, _ = session.find("radio", f"{q}. ")
+        session.set_value("radio", f"{q}. ", random.choice(list(element.options)))
+        await session.click("Next ➡️")
+    await think()
+    await session.click("📄 Prepare PDF Report")
+
+
+async def warm_up(url):
+    # Closed inside the loop: tornado needs a running event loop to send the close frame.
+    session = AppSession(url)
+    try:
+        await complete_flow(session, 0)
+    finally:
+        session.close()
+
+
+def resident_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else None
+
+
+async def run_level(url, n, think_time, server_pid):
+    rss_before = resident_kb(server_pid) if server_pid else None
+    sessions = [AppSession(url) for _ in range(n)]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(complete_flow(s, think_time) for s in sessions), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    rss_after = resident_kb(server_pid) if server_pid else None
+    for session in sessions:
+        session.close()
+
+    latencies = [ms for s in sessions for ms in s.latencies]
+    errors = [repr(o) for o in outcomes if isinstance(o, BaseException)]
+    return {
+        "sessions": n,
+        "completed": n - len(errors),
+        "errors": errors[:5],
+        "reruns": len(latencies),
+        "elapsed_s": round(elapsed, 2),
+        "flows_per_s": round((n - len(errors)) / elapsed, 3),
+        "reruns_per_s": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+        "mean_ms": round(statistics.fmean(latencies), 1) if latencies else None,
+        "rss_kb_before": rss_before,
+        "rss_kb_after": rss_after,
+        "rss_kb_per_session": round((rss_after - rss_before) / n, 1) if rss_before and rss_after else None,
+    }
+
+
+def start_server(port, data_dir):
+    env = {**os.environ, "PPD_DATA_DIR": data_dir, "PPD_METRICS_PORT": "0"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            urllib.request.urlopen(url + "/_stcore/health", timeout=1)
+            return proc, url
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp concurrent questionnaire sessions against the app.")
+    parser.add_argument("--levels", default="1,5,10,25", help="comma-separated session counts")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean seconds between clicks")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--url", help="use an already running instance instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="with --url: pid whose memory to sample")
+    parser.add_argument("--output", help="write JSON results here")
+    args = parser.parse_args()
+
+    proc = data_dir = None
+    server_pid = args.server_pid
+    if args.url:
+        url = args.url
+    else:
+        data_dir = tempfile.mkdtemp(prefix="ppd-load-")
+        try:
+            proc, url = start_server(args.port, data_dir)
+        except BaseException:
+            shutil.rmtree(data_dir, ignore_errors=True)
+            raise
+        server_pid = proc.pid
+    try:
+        # Warm the process (imports, model, assets) so level 1 measures steady state.
+        asyncio.run(warm_up(url))
+        results = []
+        for n in (int(level) for level in args.levels.split(",")):
+            level = asyncio.run(run_level(url, n, args.think_time, server_pid))
+            results.append(level)
+            print(f"N={n:<4} flows/s={level['flows_per_s']:<7} reruns/s={level['reruns_per_s']:<8} "
+                  f"p50={level['p50_ms']}ms p95={level['p95_ms']}ms p99={level['p99_ms']}ms "
+                  f"rss/session={level['rss_kb_per_session']}KB errors={len(level['errors'])}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if data_dir is not None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"url": url, "think_time": args.think_time,
+                                                  "levels": results}, indent=2))
+
+
+if __name__ == "__main__":
+    os.chdir(APP_DIR)
+    main()
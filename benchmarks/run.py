@@ -0,0 +1,230 @@
+"""Per-page rerun latency and inference cost benchmarks.
+
+    python benchmarks/run.py                      # run, compare to baseline
+    python benchmarks/run.py --update-baseline    # accept current numbers
+    python benchmarks/run.py --output results.json --repeat 10
+
+Drives app.py headlessly with Streamlit's AppTest through HOME, every TAKE
+TEST step, the result screen (prediction, gauge, PDF), RESULT EXPLANATION,
+FEEDBACK, RESOURCES, DASHBOARD and the MOMLY chat. For each rerun it records
+wall time, the peak Python allocation made by that rerun on top of what was
+already live (tracemalloc) and the serialized size of the element tree sent
+to the browser. It also microbenchmarks the model,
+label encoder, compiled scorer and PDF rendering.
+
+A metric regresses when it exceeds baseline * threshold; thresholds can be
+overridden per metric in the baseline file under "thresholds".
+
+Screenings and feedback written by the simulated sessions go to a scratch
+PPD_DATA_DIR that is deleted afterwards, never to the real stores.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLDS = {"wall_ms": 1.25, "alloc_peak_kb": 1.25, "payload_bytes": 1.10, "median_us": 1.25}
+ADMIN_PASSWORD = "benchmark"
+
+sys.path.insert(0, str(APP_DIR))
+
+
+# --- Headless app session ---
+def _payload_bytes(node):
+    """Serialized protobuf size of an AppTest element tree."""
+    size = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        size += proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        size += _payload_bytes(child)
+    return size
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+class Session:
+    """One AppTest session that records a measurement for every rerun."""
+
+    def __init__(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=60)
+        self.samples = []
+
+    def step(self, name, action=None):
+        """Applies action (which should return an element or the AppTest) and reruns."""
+        target = action(self.at) if action else self.at
+        # reset_peak() sets the peak to what is live now, so subtract that to
+        # measure this rerun rather than everything retained since tracing began.
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        started = timeit.default_timer()
+        target.run()
+        wall_ms = (timeit.default_timer() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+        self.samples.append((name, {
+            "wall_ms": wall_ms,
+            "alloc_peak_kb": (peak - before) / 1024,
+            "payload_bytes": _payload_bytes(self.at.main) + _payload_bytes(self.at.sidebar),
+        }))
+
+    def navigate(self, page):
+        self.step(f"nav {page}", lambda at: at.sidebar.radio[0].set_value(page))
+
+
+def run_flow():
+    """One complete visit: every page, the full questionnaire and the chat."""
+    session = Session()
+    session.step("HOME first load")
+    session.step("HOME -> START TEST", lambda at: _button(at, "START TEST").click())
+
+    def fill_details(at):
+        at.text_input[0].input("Benchmark")
+        at.text_input[1].input("Testville")
+        at.slider[0].set_value(29)
+        at.selectbox[0].set_value("Low")
+        return _button(at, "Start Questionnaire").click()
+
+    session.step("TAKE TEST details", fill_details)
+    for q in range(1, 11):
+        def answer(at, q=q):
+            radio = at.radio(key=f"q{q}")
+            radio.set_value(radio.options[q % 4])
+            return _button(at, "Next ➡️").click()
+        session.step("TAKE TEST result" if q == 10 else f"TAKE TEST Q{q}", answer)
+    session.step("result PDF", lambda at: _button(at, "📄 Prepare PDF Report").click())
+
+    for page in ["RESULT EXPLANATION", "FEEDBACK", "RESOURCES", "DASHBOARD"]:
+        session.navigate(page)
+    session.step("DASHBOARD login", lambda at: at.text_input[0].input(ADMIN_PASSWORD))
+    session.navigate("HOME")
+
+    session.step("MOMLY open", lambda at: _button(at, "💬").click())
+    session.step("MOMLY feeling", lambda at: at.radio(key="feeling_radio").set_value("Anxious"))
+    session.step("MOMLY details", lambda at: _button(at, "🎗️ Show me what to do").click())
+    session.step("MOMLY reset", lambda at: _button(at, "🔄 Reset Chat").click())
+    return session.samples
+
+
+# --- Microbenchmarks ---
+def _median_us(func, number):
+    runs = timeit.repeat(func, number=number, repeat=7)
+    return statistics.median(runs) / number * 1e6
+
+
+def run_micro():
+    from model_registry import ModelRegistry, build_input_frame
+    from report import render_report_pdf
+
+    handle = ModelRegistry(use_compiled=False).current()
+    frame = build_input_frame(29, "Low", [1, 2, 1, 0, 3, 1, 2, 1, 0, 1])
+    encoded = handle.model.predict(frame)
+    results = {
+        "DataFrame construction": _median_us(lambda: build_input_frame(29, "Low", [1] * 10), 200),
+        "model.predict": _median_us(lambda: handle.model.predict(frame), 200),
+        "le.inverse_transform": _median_us(lambda: handle.le.inverse_transform(encoded), 1000),
+        "FPDF render": _median_us(lambda: render_report_pdf("Benchmark", "Testville", 29, "Low", 12, "Moderate"), 50),
+    }
+    compiled = ModelRegistry().current()
+    if compiled.scorer is not None:
+        results["compiled scorer predict"] = _median_us(lambda: compiled.scorer.predict(29, "Low", [1] * 10), 5000)
+    if compiled.lookup is not None:
+        results["lookup table predict"] = _median_us(lambda: compiled.lookup.lookup(29, "Low", [1] * 10), 20000)
+    return {name: {"median_us": us} for name, us in results.items()}
+
+
+# --- Baseline comparison ---
+def collect(repeat):
+    tracemalloc.start()
+    flows = [run_flow() for _ in range(repeat)]
+    tracemalloc.stop()
+
+    reruns = {}
+    for name, _ in flows[0]:
+        samples = [dict(flow)[name] for flow in flows]
+        reruns[name] = {metric: round(statistics.median(s[metric] for s in samples), 3)
+                        for metric in samples[0]}
+    micro = {name: {k: round(v, 3) for k, v in entry.items()} for name, entry in run_micro().items()}
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat,
+                 "questionnaire_mode": os.environ.get("PPD_QUESTIONNAIRE_MODE", "fragment")},
+        "reruns": reruns,
+        "micro": micro,
+    }
+
+
+def compare(results, baseline):
+    """Returns a list of human-readable regressions against the baseline."""
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    regressions = []
+    for section in ("reruns", "micro"):
+        for name, metrics in results[section].items():
+            base = baseline.get(section, {}).get(name)
+            if not base:
+                continue
+            for metric, value in metrics.items():
+                if not base.get(metric):
+                    continue
+                limit = base[metric] * thresholds.get(metric, 1.25)
+                if value > limit:
+                    regressions.append(f"{section}/{name} {metric}: {value:.1f} > {limit:.1f} "
+                                       f"(baseline {base[metric]:.1f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page reruns and inference cost.")
+    parser.add_argument("--repeat", type=int, default=3, help="complete app sessions to run")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(APP_DIR)
+    data_dir = tempfile.mkdtemp(prefix="ppd-bench-")
+    os.environ.update({"PPD_DATA_DIR": data_dir, "PPD_ADMIN_PASSWORD": ADMIN_PASSWORD, "PPD_METRICS_PORT": "0"})
+    try:
+        results = collect(args.repeat)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    for name, m in results["reruns"].items():
+        print(f"{name:<28} {m['wall_ms']:>9.1f} ms {m['alloc_peak_kb']:>10.0f} KB {m['payload_bytes']:>9.0f} B")
+    for name, m in results["micro"].items():
+        print(f"{name:<28} {m['median_us']:>9.1f} us")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        previous = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        results["thresholds"] = previous.get("thresholds", DEFAULT_THRESHOLDS)
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline updated: {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+        return
+
+    regressions = compare(results, json.loads(baseline_path.read_text()))
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
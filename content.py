@@ -0,0 +1,78 @@
+"""Questionnaire and support content, loaded from locale bundles.
+
+Each ``locales/<locale>.json`` holds the EPDS questions, result tips,
+resource links and MOMLY comfort content for one language. Bundles are
+parsed once per process into read-only structures and reloaded only when
+the file changes on disk.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+LOCALES_DIR = Path(__file__).resolve().parent / "locales"
+DEFAULT_LOCALE = "en"
+
+# Input domain of the TAKE TEST form; the model inputs, lookup table, batch
+# scorer, HTTP service and resume links all import it from here.
+AGE_MIN, AGE_MAX = 18, 45
+SUPPORT_LEVELS = ["High", "Medium", "Low"]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(val) for key, val in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+class ContentBundle:
+    """One immutable, versioned locale bundle."""
+
+    def __init__(self, locale, raw_bytes):
+        data = json.loads(raw_bytes)
+        self.locale = locale
+        self.version = hashlib.sha256(raw_bytes).hexdigest()[:12]
+        # (question text, {option label: value}) in questionnaire order.
+        self.questions = tuple(
+            (q["text"], MappingProxyType({opt["label"]: opt["value"] for opt in q["options"]}))
+            for q in data["questions"])
+        # Per question, {value: option label}, for showing answers back to the user.
+        self.answer_labels = tuple(MappingProxyType({val: label for label, val in options.items()})
+                                   for _, options in self.questions)
+        self.tips = _freeze(data["tips"])
+        self.resources = _freeze(data["resources"])
+        self.momly_support = _freeze(data["momly_support"])
+
+
+class ContentRegistry:
+    """Holds the parsed bundle for one locale, reloading it when the file changes."""
+
+    def __init__(self, locale=DEFAULT_LOCALE, check_interval=5.0):
+        self.path = LOCALES_DIR / f"{locale}.json"
+        self.locale = locale
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self._bundle = ContentBundle(locale, self.path.read_bytes())
+        self._last_check = time.monotonic()
+
+    def current(self):
+        """Returns the live ContentBundle."""
+        if time.monotonic() - self._last_check < self.check_interval:
+            return self._bundle
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime != self._mtime:
+                    self._bundle = ContentBundle(self.locale, self.path.read_bytes())
+                    self._mtime = mtime
+            except (OSError, ValueError, KeyError):
+                # A missing or half-edited bundle: keep serving the last good one.
+                pass
+        return self._bundle
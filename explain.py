@@ -0,0 +1,41 @@
+"""What-if explanations for a single screening result."""
+
+from content import SUPPORT_LEVELS
+
+
+def what_if_table(handle, age, support, q_values):
+    """Scores every single-answer change to Q1-Q10 and FamilySupport.
+
+    All variants (up to 32 rows plus the original answers) go through one
+    ``predict_proba_batch`` call. Returns (base_label, rows), where each row
+    is a dict with the changed feature, its current and alternative value,
+    the resulting risk level and the change in probability of the current
+    risk level.
+    """
+    variants = [(None, None, support, list(q_values))]
+    for i, current in enumerate(q_values):
+        for alt in range(4):
+            if alt != current:
+                changed = list(q_values)
+                changed[i] = alt
+                variants.append((f"Q{i+1}", alt, support, changed))
+    for alt in SUPPORT_LEVELS:
+        if alt != support:
+            variants.append(("FamilySupport", alt, alt, list(q_values)))
+
+    proba = handle.predict_proba_batch([age] * len(variants), [v[2] for v in variants], [v[3] for v in variants])
+    best = proba.argmax(axis=1)
+    base_class = best[0]
+    base_p = proba[0, base_class]
+
+    rows = []
+    for (feature, alt, _, _), p, cls in zip(variants[1:], proba[1:], best[1:]):
+        rows.append({
+            "feature": feature,
+            "current": support if feature == "FamilySupport" else q_values[int(feature[1:]) - 1],
+            "alternative": alt,
+            "risk_level": handle.labels[cls],
+            "changes_result": bool(cls != base_class),
+            "delta_p": float(p[base_class] - base_p),
+        })
+    return handle.labels[base_class], rows
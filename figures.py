@@ -0,0 +1,48 @@
+"""Plotly figures for result visualizations, built once per process.
+
+Figures that depend only on a small, discrete key (a risk level, a theme)
+are registered with ``@figure_builder`` and fetched through ``get_figure``,
+which caches one shared instance per key across all sessions. Cached
+figures must be treated as read-only.
+"""
+import streamlit as st
+
+FIGURE_BUILDERS = {}
+
+THEMES = {
+    "default": {"bar": "deeppink", "steps": ["lightgreen", "gold", "red"]},
+}
+
+
+def figure_builder(kind):
+    """Registers a function that builds the figure for ``kind`` from its key arguments."""
+    def register(build):
+        FIGURE_BUILDERS[kind] = build
+        return build
+    return register
+
+
+@figure_builder("risk_gauge")
+def build_risk_gauge(level, theme="default"):
+    import plotly.graph_objects as go
+
+    colors = THEMES[theme]
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=level,
+        number={"suffix": " / 3"},
+        gauge={
+            "axis": {"range": [0, 3]},
+            "bar": {"color": colors["bar"]},
+            "steps": [
+                {"range": [i, i + 1], "color": color} for i, color in enumerate(colors["steps"])
+            ]
+        },
+        title={"text": "Risk Level"}
+    ))
+
+
+@st.cache_resource(max_entries=256)
+def get_figure(kind, *key):
+    """Returns the shared figure for (kind, *key), building it on first use."""
+    return FIGURE_BUILDERS[kind](*key)
@@ -0,0 +1,151 @@
+"""Precomputed risk for every possible questionnaire.
+
+Age (18-45) x FamilySupport (3) x Q1-Q10 (4**10) is ~88M cells, one byte
+each. Compile once per model version, then every server process maps the
+same file read-only:
+
+    python lookup_table.py --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from content import AGE_MAX, AGE_MIN, SUPPORT_LEVELS
+
+TABLE_PATH = "ppd_risk_lookup.u8"
+ANSWER_SPACE = 4 ** 10
+N_CELLS = (AGE_MAX - AGE_MIN + 1) * len(SUPPORT_LEVELS) * ANSWER_SPACE
+
+
+def header_path(path):
+    """The JSON sidecar holding a table's model version and labels."""
+    return path + ".json"
+
+
+def cell_index(age, support_idx, q_values):
+    """Flat index of one questionnaire; answers are packed two bits each, Q1 highest."""
+    code = 0
+    for val in q_values:
+        code = (code << 2) | val
+    return ((age - AGE_MIN) * len(SUPPORT_LEVELS) + support_idx) * ANSWER_SPACE + code
+
+
+class RiskLookupTable:
+    """Read-only, memory-mapped view of a compiled lookup file.
+
+    Raises ValueError if the header is unreadable or the file is not a whole table.
+    """
+
+    def __init__(self, path=TABLE_PATH):
+        with open(header_path(path)) as f:
+            header = json.load(f)
+        size = os.path.getsize(path)
+        if size != N_CELLS:
+            raise ValueError(f"{path}: {size} bytes, expected {N_CELLS}")
+        self.version = header["version"]
+        self.encoded = header["classes"]
+        self.labels = header["labels"]
+        self.cells = np.memmap(path, dtype=np.uint8, mode='r', shape=(N_CELLS,))
+        self._support_index = {s: i for i, s in enumerate(SUPPORT_LEVELS)}
+
+    @classmethod
+    def load_if_current(cls, version, path=TABLE_PATH):
+        """Returns the table only if it was compiled from the given model version."""
+        if not (os.path.exists(path) and os.path.exists(header_path(path))):
+            return None
+        table = cls(path)
+        return table if table.version == version else None
+
+    def lookup(self, age, support, q_values):
+        """Returns (pred_encoded, pred_label), or None for inputs outside the table."""
+        support_idx = self._support_index.get(support)
+        if (support_idx is None or not AGE_MIN <= age <= AGE_MAX or len(q_values) != 10
+                or any(not 0 <= val <= 3 for val in q_values)):
+            return None
+        slot = self.cells[cell_index(age, support_idx, q_values)]
+        return self.encoded[slot], self.labels[slot]
+
+
+# --- Offline compiler ---
+_worker_model = None
+
+
+def _init_worker(model_path):
+    global _worker_model
+    import joblib
+    _worker_model = joblib.load(model_path)
+
+
+def _compile_block(task):
+    """Predicts one chunk of the answer space for a fixed age and support level."""
+    import pandas as pd
+
+    path, classes, age, support_idx, start, stop = task
+    codes = np.arange(start, stop, dtype=np.int64)
+    q_matrix = np.column_stack([(codes >> (2 * (9 - i))) & 3 for i in range(10)])
+    frame = pd.DataFrame({"Age": age, "FamilySupport": SUPPORT_LEVELS[support_idx],
+                          **{f"Q{i+1}": q_matrix[:, i] for i in range(10)},
+                          "EPDS_Score": q_matrix.sum(axis=1)})
+    pred = _worker_model.predict(frame)
+    slots = np.searchsorted(classes, pred).astype(np.uint8)
+
+    cells = np.memmap(path, dtype=np.uint8, mode='r+', shape=(N_CELLS,))
+    offset = ((age - AGE_MIN) * len(SUPPORT_LEVELS) + support_idx) * ANSWER_SPACE
+    cells[offset + start:offset + stop] = slots
+    cells.flush()
+    return stop - start
+
+
+def compile_table(path=TABLE_PATH, workers=None, chunk_size=1 << 18):
+    """Sweeps the whole input space through batched predict calls in a process pool."""
+    from model_registry import ModelRegistry
+
+    registry = ModelRegistry(use_compiled=False)
+    handle = registry.current()
+    classes = np.asarray(handle.model.classes_)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    np.memmap(tmp_path, dtype=np.uint8, mode='w+', shape=(N_CELLS,)).flush()
+
+    tasks = [(tmp_path, classes, age, support_idx, start, min(start + chunk_size, ANSWER_SPACE))
+             for age in range(AGE_MIN, AGE_MAX + 1)
+             for support_idx in range(len(SUPPORT_LEVELS))
+             for start in range(0, ANSWER_SPACE, chunk_size)]
+    done = 0
+    started = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(registry.model_path,)) as pool:
+        for rows in pool.imap_unordered(_compile_block, tasks):
+            done += rows
+            print(f"\r{done / N_CELLS:6.1%}  {done / (time.perf_counter() - started):,.0f} rows/s", end="", flush=True)
+    print()
+
+    header = {
+        "version": handle.version,
+        "classes": [c.item() for c in classes],
+        "labels": [str(label) for label in handle.le.inverse_transform(classes)],
+    }
+    # Data first, then the sidecar, each swapped in whole. In between, the old
+    # header names the old version, so readers skip the table rather than misread it.
+    os.replace(tmp_path, path)
+    tmp_header = f"{header_path(path)}.{os.getpid()}.tmp"
+    with open(tmp_header, 'w') as f:
+        json.dump(header, f)
+    os.replace(tmp_header, header_path(path))
+    return handle.version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the exhaustive EPDS risk lookup table.")
+    parser.add_argument("--output", default=TABLE_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1 << 18)
+    args = parser.parse_args()
+    version = compile_table(args.output, args.workers, args.chunk_size)
+    print(f"Wrote {args.output} for model version {version}")
+
+
+if __name__ == "__main__":
+    main()
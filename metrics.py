@@ -0,0 +1,135 @@
+"""In-process timing spans and counters, exposed in Prometheus text format.
+
+    with span("model_predict"):
+        ...
+    count("ppd_screenings_total", risk_level="Mild")
+
+``start_metrics_server`` serves ``/metrics`` on a local port from a daemon
+thread. Setting PPD_PROFILE_SAMPLE to a fraction (e.g. 0.01) makes
+``maybe_profile`` run that share of reruns under cProfile and dump the
+stats into ./profiles for offline inspection.
+"""
+import bisect
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_DIR = "profiles"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+def observe(name, seconds):
+    """Adds one duration to the ``ppd_span_seconds`` histogram for ``name``."""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            hist["buckets"][index] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block into the histogram for ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def count(metric, value=1, **labels):
+    """Increments a labelled counter, e.g. count("ppd_screenings_total", risk_level="Mild")."""
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def _labels(pairs):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+
+def render_prometheus():
+    """Returns all metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {name: {**h, "buckets": list(h["buckets"])} for name, h in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = ["# HELP ppd_span_seconds Time spent in instrumented hot sections.",
+             "# TYPE ppd_span_seconds histogram"]
+    for name, hist in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS, hist["buckets"]):
+            cumulative += n
+            lines.append(f'ppd_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'ppd_span_seconds_bucket{{span="{name}",le="+Inf"}} {hist["count"]}')
+        lines.append(f'ppd_span_seconds_sum{{span="{name}"}} {hist["sum"]:.6f}')
+        lines.append(f'ppd_span_seconds_count{{span="{name}"}} {hist["count"]}')
+
+    for metric in sorted({metric for metric, _ in counters}):
+        lines.append(f"# TYPE {metric} counter")
+        for (name, labels), value in sorted(counters.items()):
+            if name == metric:
+                lines.append(f"{metric}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serves /metrics from a daemon thread; returns the server, or None if the port is taken."""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as exc:
+        logger.warning("metrics: could not listen on %s:%s (%s)", host, port, exc)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+@contextmanager
+def maybe_profile(label):
+    """Runs the block under cProfile for a PPD_PROFILE_SAMPLE fraction of calls."""
+    rate = float(os.environ.get("PPD_PROFILE_SAMPLE", "0") or 0)
+    if rate <= 0 or random.random() >= rate:
+        yield
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() else "_" for c in label)
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{safe_label}.prof"))
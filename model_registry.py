@@ -0,0 +1,198 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import joblib
+import pandas as pd
+
+from artifact import ARTIFACT_PATH, ModelArtifact
+from lookup_table import TABLE_PATH, RiskLookupTable, header_path
+from metrics import span
+from scorer import BUNDLE_PATH, CompiledScorer
+
+MODEL_PATH = "ppd_model_pipeline.pkl"
+ENCODER_PATH = "label_encoder.pkl"
+
+logger = logging.getLogger(__name__)
+
+QUESTION_COLUMNS = [f"Q{i}" for i in range(1, 11)]
+FEATURE_COLUMNS = ["Age", "FamilySupport", *QUESTION_COLUMNS, "EPDS_Score"]
+
+
+def file_sha256(path):
+    """Returns the hex SHA-256 of a file without unpickling it."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_input_frame(age, support, q_values):
+    """Builds the one-row DataFrame the pipeline was trained on."""
+    return pd.DataFrame([{
+        "Age": age,
+        "FamilySupport": support,
+        **{f"Q{i+1}": val for i, val in enumerate(q_values)},
+        "EPDS_Score": sum(q_values)
+    }], columns=FEATURE_COLUMNS)
+
+
+class ModelHandle:
+    """An immutable, loaded model version shared read-only by all sessions.
+
+    Single predictions are answered from the precomputed lookup table, then
+    the compiled NumPy scorer, then the pipeline, using only artifacts built
+    from this exact version. A handle loaded from the memory-mapped artifact
+    has no pipeline (``model`` and ``le`` are None) and always uses the scorer.
+    """
+
+    def __init__(self, model, le, version, scorer=None, lookup=None):
+        self.model = model
+        self.le = le
+        self.version = version
+        self.scorer = scorer
+        self.lookup = lookup
+        if model is None:
+            self.classes = scorer.classes
+            self.labels = scorer.labels
+        else:
+            self.classes = model.classes_
+            self.labels = [str(label) for label in le.inverse_transform(model.classes_)]
+
+    def predict(self, age, support, q_values):
+        """Returns (pred_encoded, pred_label) for one set of answers."""
+        if self.lookup is not None:
+            with span("lookup_predict"):
+                hit = self.lookup.lookup(age, support, q_values)
+            if hit is not None:
+                return hit
+        if self.scorer is not None:
+            with span("scorer_predict"):
+                return self.scorer.predict(age, support, q_values)
+        with span("dataframe_build"):
+            frame = build_input_frame(age, support, q_values)
+        with span("model_predict"):
+            pred_encoded = self.model.predict(frame)[0]
+        with span("label_decode"):
+            pred_label = self.le.inverse_transform([pred_encoded])[0]
+        return pred_encoded, pred_label
+
+    def predict_proba_batch(self, ages, supports, q_matrix):
+        """Class probabilities for many rows in one call; columns follow ``self.labels``."""
+        if self.scorer is not None:
+            return self.scorer.predict_proba_batch(ages, supports, q_matrix)
+        frame = pd.DataFrame([{
+            "Age": age,
+            "FamilySupport": support,
+            **{f"Q{i+1}": val for i, val in enumerate(q_values)},
+            "EPDS_Score": sum(q_values)
+        } for age, support, q_values in zip(ages, supports, q_matrix)], columns=FEATURE_COLUMNS)
+        return self.model.predict_proba(frame)
+
+    def warm_up(self):
+        """Runs one prediction so the first real user doesn't pay for lazy init."""
+        self.predict(25, "Medium", [0] * 10)
+
+
+class ModelRegistry:
+    """Process-wide model holder with hot-reload on artifact change.
+
+    Every rerun calls ``current()``, which only stats the pickles and the
+    compiled files (at most once per ``check_interval`` seconds). When an
+    mtime moves, the files are hashed and, if the content really changed, the
+    new version is loaded and warmed up before being swapped in, so readers
+    never see a half-loaded model. A rebuilt artifact, bundle or lookup table
+    is picked up the same way.
+
+    With ``use_compiled``, an artifact exported from the same version is
+    memory-mapped instead of unpickling the pipeline.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, encoder_path=ENCODER_PATH, check_interval=5.0,
+                 bundle_path=BUNDLE_PATH, table_path=TABLE_PATH, use_compiled=True,
+                 artifact_path=ARTIFACT_PATH):
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self.bundle_path = bundle_path
+        self.artifact_path = artifact_path
+        self.table_path = table_path
+        self.use_compiled = use_compiled
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._handle = None
+        self._mtimes = None
+        self._last_check = 0.0
+        self._reload()
+
+    def _stat(self):
+        """mtimes of the pickles, then of the compiled files and table header (None while one is absent)."""
+        compiled = []
+        if self.use_compiled:
+            for path in (self.artifact_path, self.bundle_path, self.table_path, header_path(self.table_path)):
+                try:
+                    compiled.append(os.stat(path).st_mtime_ns)
+                except FileNotFoundError:
+                    compiled.append(None)
+        return (os.stat(self.model_path).st_mtime_ns, os.stat(self.encoder_path).st_mtime_ns, *compiled)
+
+    def _version(self):
+        digest = hashlib.sha256()
+        digest.update(file_sha256(self.model_path).encode())
+        digest.update(file_sha256(self.encoder_path).encode())
+        return digest.hexdigest()[:12]
+
+    def _reload(self):
+        mtimes = self._stat()
+        version = self._version()
+        # Rebuilt compiled files carry no new version of their own, so a change in them forces a load.
+        compiled_changed = self._mtimes is not None and mtimes[2:] != self._mtimes[2:]
+        if self._handle is None or version != self._handle.version or compiled_changed:
+            with span("model_load"):
+                handle = self._load_artifact(version) if self.use_compiled else None
+                if handle is None:
+                    scorer = lookup = None
+                    if self.use_compiled:
+                        scorer = CompiledScorer.load_if_current(version, self.bundle_path)
+                        lookup = self._load_table(version)
+                    handle = ModelHandle(joblib.load(self.model_path), joblib.load(self.encoder_path), version,
+                                         scorer, lookup)
+                handle.warm_up()
+            self._handle = handle
+        self._mtimes = mtimes
+        self._last_check = time.monotonic()
+
+    def _load_artifact(self, version):
+        try:
+            artifact = ModelArtifact.load_if_current(version, self.artifact_path)
+        except (OSError, ValueError) as exc:
+            logger.warning("model: ignoring unusable artifact (%s); loading the pickles", exc)
+            return None
+        if artifact is None:
+            return None
+        return ModelHandle(None, None, version, artifact.scorer(), self._load_table(version))
+
+    def _load_table(self, version):
+        try:
+            return RiskLookupTable.load_if_current(version, self.table_path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("model: ignoring unusable lookup table (%s)", exc)
+            return None
+
+    def current(self):
+        """Returns the live ModelHandle, reloading first if the artifacts changed."""
+        if time.monotonic() - self._last_check < self.check_interval:
+            return self._handle
+        with self._lock:
+            if time.monotonic() - self._last_check >= self.check_interval:
+                try:
+                    if self._stat() != self._mtimes:
+                        self._reload()
+                    else:
+                        self._last_check = time.monotonic()
+                except Exception:
+                    # A half-written or removed artifact: keep serving the old model.
+                    self._last_check = time.monotonic()
+        return self._handle
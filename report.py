@@ -0,0 +1,169 @@
+"""EPDS result reports.
+
+The app renders single reports in memory; clinics can also export a ZIP of
+reports for a batch of scored records (e.g. the output of batch_score.py):
+
+    python report.py bulk scored.csv reports.zip --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from fpdf import FPDF
+
+
+def report_filename(name):
+    """Download name for a report, e.g. 'Asha_PPD_Result.pdf'."""
+    return f"{name.strip().replace(' ', '_') or 'PPD'}_PPD_Result.pdf"
+
+
+def pdf_text(text):
+    """The text as the core PDF fonts can draw it (Latin-1 only).
+
+    Accented letters outside Latin-1 lose their accents; other characters,
+    e.g. Malayalam script, become "?".
+    """
+    chars = []
+    for char in text:
+        if ord(char) > 0xFF:
+            folded = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+            char = folded if folded and all(ord(c) <= 0xFF for c in folded) else "?"
+        chars.append(char)
+    return "".join(chars)
+
+
+def render_report_pdf(name, place, age, support, score, pred_label):
+    """Renders the one-page EPDS result report straight to PDF bytes."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt="Postpartum Depression Risk Prediction", ln=True, align='C')
+    pdf.cell(200, 10, txt=f"Name: {name}", ln=True)
+    pdf.cell(200, 10, txt=f"Place: {place}", ln=True)
+    pdf.cell(200, 10, txt=f"Age: {age}", ln=True)
+    pdf.cell(200, 10, txt=f"Support Level: {support}", ln=True)
+    pdf.cell(200, 10, txt=f"Total Score: {score}", ln=True)
+    pdf.cell(200, 10, txt=f"Predicted Risk Level: {pred_label}", ln=True)
+    pdf.cell(200, 10, txt="(Assessment based on the EPDS - Edinburgh Postnatal Depression Scale)", ln=True)
+
+    # PyFPDF 1.7 returns a latin-1 str for dest='S'; fpdf2 returns a bytearray.
+    data = pdf.output(dest='S')
+    return data.encode('latin-1') if isinstance(data, str) else bytes(data)
+
+
+# --- Bulk export ---
+REQUIRED_FIELDS = ["Age", "FamilySupport", "EPDS_Score", "risk_level"]
+
+
+def _field(rec, key):
+    """Record value as report text; missing, None and NaN/NA become "", 29.0 becomes "29"."""
+    value = rec.get(key)
+    try:
+        if value is None or value != value:
+            return ""
+    except TypeError:
+        # pandas.NA refuses to be compared.
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _render_batch(batch):
+    """Renders (index, record) pairs.
+
+    Returns ((zip entry name, pdf bytes) pairs, (index, reason) pairs for
+    records that could not be rendered).
+    """
+    entries, failures = [], []
+    for index, rec in batch:
+        fields = {key: _field(rec, key) for key in ["Name", "Place", *REQUIRED_FIELDS]}
+        missing = [key for key in REQUIRED_FIELDS if not fields[key]]
+        if missing:
+            failures.append((index, f"missing {', '.join(missing)}"))
+            continue
+        try:
+            data = render_report_pdf(fields["Name"], fields["Place"], fields["Age"], fields["FamilySupport"],
+                                     fields["EPDS_Score"], fields["risk_level"])
+        except Exception as exc:
+            # e.g. a name outside Latin-1, which the core PDF fonts cannot encode.
+            failures.append((index, f"{type(exc).__name__}: {exc}"))
+            continue
+        entries.append((f"{index:06d}_{report_filename(fields['Name'])}", data))
+    return entries, failures
+
+
+def export_reports_zip(records, out, workers=None, batch_size=64):
+    """Renders records in a process pool and streams each finished batch into a ZIP.
+
+    records is any iterable of dicts with Name, Place, Age, FamilySupport,
+    EPDS_Score and risk_level; out is a path or writable binary stream. At
+    most two batches per worker are pending, so memory stays bounded. A
+    record that cannot be rendered is skipped, not fatal.
+    Returns (reports written, [(record number, reason)], seconds taken).
+    """
+    workers = workers or os.cpu_count() or 1
+    numbered = enumerate(records, 1)
+    written = 0
+    failures = []
+    started = time.perf_counter()
+    # PDFs are already compressed; deflating them again only costs CPU.
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(workers) as pool:
+        max_pending = 2 * workers
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                batch = list(islice(numbered, batch_size))
+                if not batch:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_render_batch, batch))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, batch_failures = future.result()
+                for entry_name, data in entries:
+                    archive.writestr(entry_name, data)
+                    written += 1
+                failures.extend(batch_failures)
+            elapsed = time.perf_counter() - started
+            print(f"\r{written:,} reports  {written / elapsed:,.0f} pages/s", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    return written, sorted(failures), time.perf_counter() - started
+
+
+def main():
+    from batch_score import read_chunks
+
+    parser = argparse.ArgumentParser(description="EPDS report tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bulk = sub.add_parser("bulk", help="Export one PDF per scored record into a ZIP archive.")
+    bulk.add_argument("input", help="CSV or .parquet of scored records (see batch_score.py)")
+    bulk.add_argument("output", help="ZIP file to write, or - for stdout")
+    bulk.add_argument("--workers", type=int, default=None)
+    bulk.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    records = (rec for chunk in read_chunks(args.input, 10000) for rec in chunk.to_dict('records'))
+    out = sys.stdout.buffer if args.output == "-" else args.output
+    written, failures, seconds = export_reports_zip(records, out, args.workers, args.batch_size)
+    print(f"Wrote {written:,} reports in {seconds:.1f}s ({written / max(seconds, 1e-9):,.0f} pages/s)",
+          file=sys.stderr)
+    if failures:
+        print(f"Skipped {len(failures):,} records:", file=sys.stderr)
+        for index, reason in failures[:20]:
+            print(f"  record {index}: {reason}", file=sys.stderr)
+        if len(failures) > 20:
+            print(f"  ... and {len(failures) - 20:,} more", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Pure-NumPy scorer compiled from the fitted sklearn pipeline.
+
+Build the bundle after (re)training and check it against the pipeline:
+
+    python scorer.py build
+    python scorer.py check --samples 20000
+"""
+import argparse
+import os
+
+import numpy as np
+
+BUNDLE_PATH = "ppd_model_bundle.npz"
+NUMERIC_COLUMNS = ["Age", *[f"Q{i}" for i in range(1, 11)], "EPDS_Score"]
+
+
+def bundle_arrays(model, le, version):
+    """Flattens the fitted pipeline and label encoder into plain NumPy arrays."""
+    preprocessing = model.named_steps["preprocessing"]
+    clf = model.named_steps["classifier"]
+    scaler = preprocessing.named_transformers_["num"]
+    encoder = preprocessing.named_transformers_["cat"]
+
+    transformers = [(name, list(cols)) for name, trans, cols in preprocessing.transformers_
+                    if name != "remainder" or trans != "drop"]
+    if transformers != [("num", NUMERIC_COLUMNS), ("cat", ["FamilySupport"])]:
+        raise ValueError(f"Unexpected preprocessing layout: {transformers}")
+    if clf.activation != "relu" or clf.out_activation_ != "softmax":
+        raise ValueError(f"Unsupported MLP activations: {clf.activation}/{clf.out_activation_}")
+    # fold_scaler gives every category its own one-hot column and unknown ones the all-zero row.
+    if encoder.drop is not None or encoder.handle_unknown != "ignore":
+        raise ValueError(f"Unsupported FamilySupport encoding: drop={encoder.drop!r}, "
+                         f"handle_unknown={encoder.handle_unknown!r}")
+
+    n_numeric = len(NUMERIC_COLUMNS)
+    arrays = {
+        "version": np.array(version),
+        "mean": np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(n_numeric), dtype=np.float64),
+        "scale": np.asarray(scaler.scale_ if scaler.with_std else np.ones(n_numeric), dtype=np.float64),
+        "support_categories": np.asarray(encoder.categories_[0]).astype(str),
+        "classes": np.asarray(clf.classes_),
+        "labels": np.asarray(le.classes_).astype(str),
+        "n_layers": np.array(len(clf.coefs_)),
+    }
+    for i, (coef, intercept) in enumerate(zip(clf.coefs_, clf.intercepts_)):
+        arrays[f"W{i}"] = np.asarray(coef, dtype=np.float64)
+        arrays[f"b{i}"] = np.asarray(intercept, dtype=np.float64)
+    return arrays
+
+
+def export_bundle(model, le, version, path=BUNDLE_PATH):
+    """Writes ``bundle_arrays`` to a .npz bundle."""
+    np.savez(path, **bundle_arrays(model, le, version))
+
+
+def fold_scaler(arrays):
+    """Folds the StandardScaler and the one-hot FamilySupport column into the first layer.
+
+    Returns the bundle with ``W0`` replaced by the scaled numeric weights and
+    ``support_bias`` holding one first-layer bias row per support category,
+    plus a last all-zeros row for unknown categories (handle_unknown="ignore").
+    """
+    n_numeric = len(NUMERIC_COLUMNS)
+    mean = arrays["mean"]
+    scale = arrays["scale"]
+    weights = arrays["W0"]
+    first_bias = arrays["b0"] - (mean / scale) @ weights[:n_numeric]
+    n_categories = len(arrays["support_categories"])
+    folded = {key: val for key, val in arrays.items() if key not in ("mean", "scale", "W0", "b0")}
+    folded["W0"] = weights[:n_numeric] / scale[:, None]
+    folded["support_bias"] = np.vstack([first_bias + weights[n_numeric + i] for i in range(n_categories)]
+                                       + [first_bias])
+    return folded
+
+
+class CompiledScorer:
+    """Runs the ColumnTransformer + MLP forward pass on plain NumPy vectors.
+
+    The StandardScaler is folded into the first layer and the one-hot
+    FamilySupport column becomes a per-category first-layer bias, so a
+    single prediction is one small matvec per layer.
+    """
+
+    def __init__(self, arrays):
+        if "support_bias" not in arrays:
+            arrays = fold_scaler(arrays)
+        self.version = str(arrays["version"])
+        n_layers = int(arrays["n_layers"])
+        self.support_index = {str(c): i for i, c in enumerate(arrays["support_categories"])}
+        self.support_bias = arrays["support_bias"]
+        self.weights = [arrays[f"W{i}"] for i in range(n_layers)]
+        self.biases = [None] + [arrays[f"b{i}"] for i in range(1, n_layers)]
+
+        self.classes = arrays["classes"]
+        self.labels = [str(label) for label in arrays["labels"][self.classes.astype(int)]]
+        self.encoded = [c.item() for c in self.classes]
+
+    @classmethod
+    def load(cls, path=BUNDLE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    @classmethod
+    def load_if_current(cls, version, path=BUNDLE_PATH):
+        """Returns the scorer only if it was exported from the given model version."""
+        if not os.path.exists(path):
+            return None
+        scorer = cls.load(path)
+        return scorer if scorer.version == version else None
+
+    def _support_rows(self, supports):
+        unknown = len(self.support_index)
+        return np.array([self.support_index.get(s, unknown) for s in supports])
+
+    def logits(self, numeric, support_rows):
+        """Forward pass on raw (n, 12) or (12,) numeric inputs; returns output-layer logits."""
+        hidden = numeric @ self.weights[0] + self.support_bias[support_rows]
+        for weight, bias in zip(self.weights[1:], self.biases[1:]):
+            np.maximum(hidden, 0, out=hidden)
+            hidden = hidden @ weight + bias
+        return hidden
+
+    def predict_proba_batch(self, ages, supports, q_matrix):
+        """Class probabilities for a batch; q_matrix is (n, 10) of 0-3 answers."""
+        q_matrix = np.asarray(q_matrix, dtype=np.float64)
+        numeric = np.column_stack([np.asarray(ages, dtype=np.float64), q_matrix, q_matrix.sum(axis=1)])
+        z = self.logits(numeric, self._support_rows(supports))
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        return z / z.sum(axis=1, keepdims=True)
+
+    def predict_batch(self, ages, supports, q_matrix):
+        """Encoded predictions for a batch, matching ``model.predict``."""
+        return self.classes[self.predict_proba_batch(ages, supports, q_matrix).argmax(axis=1)]
+
+    def predict(self, age, support, q_values):
+        """Returns (pred_encoded, pred_label) for one set of answers."""
+        numeric = np.empty(len(NUMERIC_COLUMNS))
+        numeric[0] = age
+        numeric[1:11] = q_values
+        numeric[11] = sum(q_values)
+        row = self.support_index.get(support, len(self.support_index))
+        best = int(self.logits(numeric, row).argmax())
+        return self.encoded[best], self.labels[best]
+
+
+def check_parity(model, scorer, samples=10000, seed=0):
+    """Scores random questionnaires with both engines.
+
+    Returns (mismatched predictions, max absolute predict_proba difference).
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(18, 46, samples)
+    supports = rng.choice(list(scorer.support_index), samples)
+    q_matrix = rng.integers(0, 4, (samples, 10))
+    frame = pd.DataFrame({"Age": ages, "FamilySupport": supports,
+                          **{f"Q{i+1}": q_matrix[:, i] for i in range(10)},
+                          "EPDS_Score": q_matrix.sum(axis=1)})
+    expected = model.predict(frame)
+    actual = scorer.predict_batch(ages, supports, q_matrix)
+    single = np.array([scorer.predict(a, s, list(q))[0] for a, s, q in zip(ages[:500], supports[:500], q_matrix[:500])])
+    proba_gap = np.abs(model.predict_proba(frame) - scorer.predict_proba_batch(ages, supports, q_matrix)).max()
+    return int((expected != actual).sum() + (expected[:500] != single).sum()), float(proba_gap)
+
+
+def main():
+    from model_registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Build or verify the NumPy scoring bundle.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    parser.add_argument("--samples", type=int, default=10000)
+    args = parser.parse_args()
+
+    handle = ModelRegistry(use_compiled=False).current()
+    if args.command == "build":
+        export_bundle(handle.model, handle.le, handle.version, args.output)
+        print(f"Wrote {args.output} for model version {handle.version}")
+
+    mismatches, proba_gap = check_parity(handle.model, CompiledScorer.load(args.output), args.samples)
+    print(f"max |predict_proba| difference: {proba_gap:.2e}")
+    print(f"{mismatches} mismatches against model.predict")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
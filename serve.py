@@ -0,0 +1,277 @@
+"""Headless HTTP scoring service with request micro-batching.
+
+    python serve.py --port 8600 --max-batch 256 --max-wait-ms 5
+
+POST /predict  {"Age": 29, "FamilySupport": "Low", "Q1": 2, ..., "Q10": 0}
+GET  /stats    latency percentiles and batch sizes
+GET  /healthz  liveness and the loaded model version (503 if no model loads)
+
+Concurrent requests are queued and scored together: a batch is flushed when
+it reaches --max-batch rows or its first row has waited --max-wait-ms. When
+--max-queue rows are already waiting, new requests get 503 + Retry-After.
+Uses only the standard library on top of the app's own dependencies.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from content import AGE_MAX, AGE_MIN, SUPPORT_LEVELS
+from model_registry import QUESTION_COLUMNS, ModelRegistry
+
+MAX_BODY_BYTES = 64 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when the batch queue is full."""
+
+
+def _is_int_between(value, lo, hi):
+    # JSON 2.0 and true are not answers: only real integers are accepted.
+    return type(value) is int and lo <= value <= hi
+
+
+def validate_row(payload):
+    """Returns a clean input row or raises ValueError with a client-facing message."""
+    if not isinstance(payload, dict):
+        raise ValueError("Body must be a JSON object")
+    row = {}
+    if not _is_int_between(payload.get("Age"), AGE_MIN, AGE_MAX):
+        raise ValueError(f"Age must be an integer from {AGE_MIN} to {AGE_MAX}")
+    row["Age"] = payload["Age"]
+    if payload.get("FamilySupport") not in SUPPORT_LEVELS:
+        raise ValueError(f"FamilySupport must be one of {SUPPORT_LEVELS}")
+    row["FamilySupport"] = payload["FamilySupport"]
+    for col in QUESTION_COLUMNS:
+        if not _is_int_between(payload.get(col), 0, 3):
+            raise ValueError(f"{col} must be an integer from 0 to 3")
+        row[col] = payload[col]
+    return row
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one predict call."""
+
+    def __init__(self, registry, max_batch=256, max_wait_ms=5.0, max_queue=4096):
+        self.registry = registry
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(max_queue)
+        self.latencies_ms = deque(maxlen=10000)
+        self.batch_sizes = deque(maxlen=1000)
+        self.rejected = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def submit(self, row):
+        """Queues a row and waits for its scored result."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((row, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded()
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score(self, rows):
+        handle = self.registry.current()
+        q_matrix = [[row[col] for col in QUESTION_COLUMNS] for row in rows]
+        proba = handle.predict_proba_batch([row["Age"] for row in rows], [row["FamilySupport"] for row in rows],
+                                           q_matrix)
+        return [{
+            "EPDS_Score": sum(q_values),
+            "pred_encoded": int(handle.classes[best]),
+            "risk_level": handle.labels[best],
+            "probabilities": {label: float(p) for label, p in zip(handle.labels, row_proba)},
+            "model_version": handle.version,
+        } for q_values, row_proba, best in zip(q_matrix, proba, proba.argmax(axis=1))]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            try:
+                results = await loop.run_in_executor(None, self._score, [row for row, _, _ in batch])
+            except Exception as exc:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            now = time.perf_counter()
+            self.batch_sizes.append(len(batch))
+            for (_, future, queued_at), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                self.latencies_ms.append((now - queued_at) * 1000)
+
+    def stats(self):
+        latencies = sorted(self.latencies_ms)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 3) if latencies else None
+
+        return {
+            "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99),
+            "samples": len(latencies),
+            "mean_batch_size": round(sum(self.batch_sizes) / len(self.batch_sizes), 2) if self.batch_sizes else None,
+            "queued": self.queue.qsize(),
+            "rejected": self.rejected,
+        }
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 server (keep-alive, JSON only) in front of a MicroBatcher."""
+
+    def __init__(self, registry=None, **batch_options):
+        self.registry = registry or ModelRegistry()
+        self.batch_options = batch_options
+        self.batcher = None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8600):
+        self.batcher = MicroBatcher(self.registry, **self.batch_options)
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _dispatch(self, method, path, body):
+        if path == "/healthz":
+            try:
+                return 200, {"status": "ok", "model_version": self.registry.current().version}
+            except Exception:
+                logger.exception("health check failed")
+                return 503, {"status": "unavailable"}
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path != "/predict":
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            row = validate_row(json.loads(body or b"null"))
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        try:
+            return 200, await self.batcher.submit(row)
+        except Overloaded:
+            return 503, {"error": "overloaded, retry shortly"}
+        except Exception:
+            logger.exception("scoring failed")
+            return 500, {"error": "internal error"}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode('latin-1').partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    status, payload = await self._dispatch(method, target.split("?")[0], body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode()
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(data)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class LocalServer:
+    """Runs a ScoringService on an ephemeral port in a background thread.
+
+    Stand-in for the deployed service in tests and load scripts:
+
+        with LocalServer() as url:
+            urllib.request.urlopen(url + "/healthz")
+    """
+
+    def __init__(self, **service_options):
+        self.service = ScoringService(**service_options)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        port = asyncio.run_coroutine_threadsafe(self.service.start(port=0), self._loop).result()
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve PPD risk predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=4096)
+    args = parser.parse_args()
+
+    async def run():
+        service = ScoringService(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                                 max_queue=args.max_queue)
+        port = await service.start(args.host, args.port)
+        print(f"Serving /predict on http://{args.host}:{port}")
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Process-wide resources shared by the pages.
+
+Each getter imports its backing module on first use, so a page only pays
+for pandas/sklearn/sqlite when it actually needs them.
+"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import streamlit as st
+
+RISK_ORDER = ["Mild", "Moderate", "Severe", "Profound"]
+
+
+# --- Metrics ---
+@st.cache_resource
+def start_metrics():
+    """Starts the /metrics endpoint once per process (PPD_METRICS_PORT, 0 disables)."""
+    from metrics import start_metrics_server
+    port = int(os.environ.get("PPD_METRICS_PORT", "9464"))
+    return start_metrics_server(port) if port else None
+
+
+# --- Content ---
+@st.cache_resource
+def get_content_registry(locale):
+    from content import ContentRegistry
+    return ContentRegistry(locale)
+
+
+def get_content(locale=None):
+    """Returns the current, read-only content bundle for a locale."""
+    from content import DEFAULT_LOCALE
+    return get_content_registry(locale or os.environ.get("PPD_LOCALE", DEFAULT_LOCALE)).current()
+
+
+# --- Load model and label encoder ---
+# No spinner: prewarm_model calls this from a thread with no page to draw on.
+@st.cache_resource(show_spinner=False)
+def get_model_registry():
+    """Loads and warms up the model once per process; shared by all sessions."""
+    from model_registry import ModelRegistry
+    return ModelRegistry()
+
+
+_prewarm_started = False
+
+
+def prewarm_model():
+    """Starts loading the model in the background so the result page finds it ready."""
+    global _prewarm_started
+    if not _prewarm_started:
+        _prewarm_started = True
+        # Deliberately without the session's ScriptRunContext, so nothing it
+        # does can write into the page the script thread is rendering.
+        threading.Thread(target=get_model_registry, name="model-prewarm", daemon=True).start()
+
+
+@st.cache_data(max_entries=100000)
+def predict_risk(model_version, age, support, q_values):
+    """Memoized (pred_encoded, pred_label) for one answer vector, shared by all sessions."""
+    pred_encoded, pred_label = get_model_registry().current().predict(age, support, list(q_values))
+    return int(pred_encoded), str(pred_label)
+
+
+@st.cache_data(max_entries=10000)
+def explain_result(model_version, age, support, q_values):
+    """What-if table for one answer vector, shared across sessions per model version."""
+    from explain import what_if_table
+    return what_if_table(get_model_registry().current(), age, support, q_values)
+
+
+# --- Stores ---
+@st.cache_resource
+def get_result_store():
+    """One screening store (and writer thread) per process."""
+    from storage import ResultStore
+    return ResultStore()
+
+
+@st.cache_resource
+def get_feedback_store():
+    """One feedback queue (and writer thread) per process."""
+    from storage import FeedbackStore
+    return FeedbackStore()
+
+
+@st.cache_data(ttl=60)
+def load_dashboard_rollup(days):
+    """Reads the pre-aggregated day x place x age band x support x risk counts."""
+    since = None
+    if days:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+    return get_result_store().load_rollup(since)
@@ -0,0 +1,80 @@
+"""Import-time breakdown for a cold app process.
+
+    python startup_report.py            # table
+    python startup_report.py --json     # machine-readable, for tracking over time
+
+Each target is imported in a fresh interpreter with ``-X importtime`` after
+streamlit itself, so the numbers are what that page adds on top of the
+framework. A page's cost is paid once per process, the first time it is
+opened.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+
+TARGETS = [
+    ("streamlit", None),
+    ("app shell", "assets, metrics, services, views.momly, views.resume"),
+    ("HOME", "views.home"),
+    ("TAKE TEST", "views.take_test"),
+    ("RESULT EXPLANATION", "views.result_explanation"),
+    ("FEEDBACK", "views.feedback"),
+    ("RESOURCES", "views.resources"),
+    ("DASHBOARD", "views.dashboard"),
+    ("resume links", "state_token"),
+    ("result screen deps", "plotly.graph_objects, report, model_registry, explain"),
+    ("store deps", "storage, pandas"),
+]
+
+
+def measure(modules, top=5):
+    """Returns (total ms, [(module, self ms), ...]) for importing modules after streamlit."""
+    code = "import streamlit" + (f"; import {modules}" if modules else "")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(self_us), int(cumulative_us)))
+
+    # Top-level imports are the ones without indentation in the name column.
+    roots = [row for row in rows if not row[0].startswith(" ")]
+    if modules:
+        # Skip everything streamlit pulled in; it is reported as its own target.
+        split = max(i for i, row in enumerate(roots) if row[0] == "streamlit") + 1
+        roots = roots[split:]
+        first = rows.index(roots[0]) if roots else len(rows)
+        rows = rows[first:]
+    total_ms = sum(row[2] for row in roots) / 1000
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return total_ms, [(name.strip(), self_us / 1000) for name, self_us, _ in heaviest]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-page import cost for a cold process.")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--top", type=int, default=5, help="heaviest modules to list per target")
+    args = parser.parse_args()
+
+    report = {}
+    for label, modules in TARGETS:
+        total_ms, heaviest = measure(modules, args.top)
+        report[label] = {"modules": modules or "streamlit", "total_ms": round(total_ms, 1),
+                         "heaviest": [{"module": name, "self_ms": round(ms, 1)} for name, ms in heaviest]}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for label, entry in report.items():
+        heaviest = ", ".join(f"{h['module']} {h['self_ms']:.0f}ms" for h in entry["heaviest"])
+        print(f"{label:<20} {entry['total_ms']:>8.1f} ms   {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compact, encrypted encoding of TAKE TEST progress for resumable URLs.
+
+A token carries the question index, the answers so far, age, family
+support, name and place in a few dozen bytes, sealed with AES-256-GCM
+under a key derived from PPD_STATE_SECRET and base64url-encoded. Any
+replica that shares the secret can open a token and resume the
+assessment; an edited, truncated or expired token is rejected, and
+whoever holds the link cannot read the name or place in it.
+
+Needs the cryptography package, which is only imported once PPD_STATE_SECRET
+is set.
+"""
+import base64
+import binascii
+import hashlib
+import os
+import struct
+import time
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    raise ImportError("Resumable links (PPD_STATE_SECRET) need cryptography, which is optional: "
+                      "pip install cryptography") from None
+
+from content import AGE_MAX, AGE_MIN, SUPPORT_LEVELS
+
+FORMAT_VERSION = 2
+N_QUESTIONS = 10
+MAX_TEXT_BYTES = 255
+NONCE_BYTES = 12
+TAG_BYTES = 16
+MAX_AGE_SECONDS = 7 * 24 * 3600
+CLOCK_SKEW_SECONDS = 60
+
+# issued at (unix seconds), question index, age, support, answer count, answers (2 bits each)
+_FIXED = struct.Struct("<IBBBBI")
+# version | nonce | ciphertext | tag; the version byte is also the associated data.
+_MAX_RAW_BYTES = 1 + NONCE_BYTES + _FIXED.size + 2 * (1 + MAX_TEXT_BYTES) + TAG_BYTES
+MAX_TOKEN_CHARS = -(-_MAX_RAW_BYTES * 4 // 3)
+_KEY_LABEL = b"ppd-state-token\0"
+
+
+def _text(value):
+    return value.encode()[:MAX_TEXT_BYTES].decode(errors="ignore").encode()
+
+
+def _cipher(secret):
+    return AESGCM(hashlib.sha256(_KEY_LABEL + secret).digest())
+
+
+def encode_state(question_index, responses, age, support, name, place, secret, issued_at=None):
+    """Returns the URL-safe token for one questionnaire's progress."""
+    packed = 0
+    for i, val in enumerate(responses):
+        packed |= int(val) << (2 * i)
+    body = _FIXED.pack(int(issued_at or time.time()), question_index, age, SUPPORT_LEVELS.index(support),
+                       len(responses), packed)
+    for value in (name, place):
+        data = _text(value)
+        body += bytes([len(data)]) + data
+    version = bytes([FORMAT_VERSION])
+    nonce = os.urandom(NONCE_BYTES)
+    sealed = _cipher(secret).encrypt(nonce, body, version)
+    return base64.urlsafe_b64encode(version + nonce + sealed).rstrip(b"=").decode()
+
+
+def decode_state(token, secret, max_age=MAX_AGE_SECONDS):
+    """Returns the progress dict stored in a token, or None if it is forged, stale or malformed."""
+    if len(token) > MAX_TOKEN_CHARS:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) < 1 + NONCE_BYTES + TAG_BYTES or raw[0] != FORMAT_VERSION:
+        return None
+    try:
+        body = _cipher(secret).decrypt(raw[1:1 + NONCE_BYTES], raw[1 + NONCE_BYTES:], raw[:1])
+    except InvalidTag:
+        return None
+    if len(body) < _FIXED.size:
+        return None
+
+    issued_at, question_index, age, support, n_responses, packed = _FIXED.unpack_from(body)
+    if not -CLOCK_SKEW_SECONDS <= time.time() - issued_at <= max_age:
+        return None
+    if (question_index > N_QUESTIONS + 1 or n_responses != max(question_index - 1, 0)
+            or not AGE_MIN <= age <= AGE_MAX or support >= len(SUPPORT_LEVELS)):
+        return None
+
+    texts = []
+    offset = _FIXED.size
+    for _ in range(2):
+        if offset >= len(body):
+            return None
+        length = body[offset]
+        texts.append(body[offset + 1:offset + 1 + length].decode(errors="replace"))
+        offset += 1 + length
+    if offset != len(body):
+        return None
+
+    return {
+        "question_index": question_index,
+        "responses": [(packed >> (2 * i)) & 3 for i in range(n_responses)],
+        "age": age,
+        "support": SUPPORT_LEVELS[support],
+        "name": texts[0],
+        "place": texts[1],
+    }
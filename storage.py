@@ -0,0 +1,426 @@
+import argparse
+import atexit
+import csv
+import glob
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+RESULTS_DB = "screenings.db"
+RESULTS_SPILL = "screenings_spill.jsonl"
+FEEDBACK_DB = "feedback.db"
+FEEDBACK_SPILL = "feedback_spill.jsonl"
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def data_path(name):
+    """Where the stores keep their files: PPD_DATA_DIR if set, else the working directory.
+
+    Benchmarks and load tests point this at a scratch directory so their
+    synthetic screenings never reach the real store.
+    """
+    data_dir = os.environ.get("PPD_DATA_DIR")
+    if not data_dir:
+        return name
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, name)
+
+
+def connect(path):
+    """Opens a SQLite connection in WAL mode (readers never block the writer)."""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class BatchWriter:
+    """Drains a bounded queue on a background thread and flushes in groups.
+
+    ``submit`` never blocks: if the queue is full the item is dropped and
+    False is returned. ``flush(items)`` runs on the writer thread with up to
+    ``max_batch`` items, gathered for at most ``max_delay`` seconds.
+    """
+
+    def __init__(self, flush, name, max_queue=10000, max_batch=500, max_delay=0.2):
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self.flush(batch)
+            except Exception:
+                logger.exception("%s: failed to flush %d items", self._thread.name, len(batch))
+
+    def close(self, timeout=5):
+        """Flushes whatever is queued and stops the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+
+# --- Durable stores ---
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SpillingStore:
+    """Base for the stores whose rows must not be lost.
+
+    Rows are queued on a ``BatchWriter``. A failed insert is retried with
+    backoff; a batch that still cannot be written, like a row that finds the
+    queue full, is appended to a JSONL spill file, which is replayed into the
+    database the next time the store starts. Subclasses create their schema,
+    set ``fields`` and ``kind`` (used in log lines) and implement ``_insert``.
+    """
+
+    fields = ()
+    kind = "store"
+    retry_delays = (0.1, 0.5, 2.0)
+
+    def __init__(self, path, spill_path, writer_name, max_queue=10000, **writer_options):
+        self.path = path
+        self.spill_path = spill_path
+        self._conn = None
+        self._spill_lock = threading.Lock()
+        self._replay_spill()
+        self.writer = BatchWriter(self._flush, name=writer_name, max_queue=max_queue, **writer_options)
+
+    def _insert(self, conn, rows):
+        raise NotImplementedError
+
+    def _submit(self, row):
+        """Queues one row, or spills it when the queue is full; False only if both fail."""
+        if self.writer.submit(row):
+            return True
+        try:
+            self._spill([row])
+        except OSError:
+            logger.exception("%s: queue full and spill file unwritable; dropping one row", self.kind)
+            return False
+        logger.warning("%s: queue full; spilled one row to %s", self.kind, self.spill_path)
+        return True
+
+    def _flush(self, rows):
+        # Runs on the writer thread, which owns self._conn.
+        for delay in (*self.retry_delays, None):
+            try:
+                if self._conn is None:
+                    self._conn = connect(self.path)
+                self._insert(self._conn, rows)
+                return
+            except sqlite3.Error:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                if delay is None:
+                    break
+                time.sleep(delay)
+        logger.error("%s: spilling %d rows to %s", self.kind, len(rows), self.spill_path)
+        self._spill(rows)
+
+    def _spill(self, rows):
+        # Called from the writer thread and, when the queue is full, from _submit.
+        data = "".join(json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows).encode()
+        with self._spill_lock, open(self.spill_path, 'ab+') as f:
+            # A process that died mid-write leaves a torn last line; start ours on a fresh one.
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+
+    def _claim_spills(self):
+        """Atomically renames spill files to this process's own name; returns the claimed paths.
+
+        A file can only be renamed away once, so processes starting together
+        never replay the same file. Claims left by processes that died
+        mid-replay (``<spill>.replay.<pid>-<n>``) are taken over.
+        """
+        claimed = []
+        for n, path in enumerate([self.spill_path, *sorted(glob.glob(glob.escape(self.spill_path) + ".replay*"))]):
+            owner = path.rpartition(".replay.")[2].partition("-")[0]
+            if owner.isdigit() and int(owner) != os.getpid() and _process_alive(int(owner)):
+                continue
+            mine = f"{self.spill_path}.replay.{os.getpid()}-{n}"
+            try:
+                os.replace(path, mine)
+            except FileNotFoundError:
+                continue
+            claimed.append(mine)
+        return claimed
+
+    def _read_spill(self, path):
+        """Returns (rows, unreadable lines) of one spill file."""
+        rows, bad = [], []
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    rows.append(tuple(record[field] for field in self.fields))
+                except (ValueError, KeyError, TypeError):
+                    bad.append(line.rstrip("\n") + "\n")
+        return rows, bad
+
+    def _replay_spill(self):
+        """Inserts claimed spill files; never stops the store from starting.
+
+        Lines that don't parse (a write cut short) are moved to ``<spill>.bad``.
+        A file that can't be inserted stays claimed and is retried on the next start.
+        """
+        claimed = self._claim_spills()
+        if not claimed:
+            return
+        conn = None
+        try:
+            # A private connection: this runs on the caller's thread, not the writer's.
+            conn = connect(self.path)
+            for path in claimed:
+                rows, bad = self._read_spill(path)
+                self._insert(conn, rows)
+                if bad:
+                    logger.warning("%s: moving %d unreadable lines of %s to %s.bad", self.kind, len(bad), path,
+                                   self.spill_path)
+                    with open(f"{self.spill_path}.bad", 'a', encoding='utf-8') as f:
+                        f.writelines(bad)
+                os.remove(path)
+        except (OSError, sqlite3.Error):
+            logger.exception("%s: spill replay failed; retrying on the next start", self.kind)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+# --- Screening results ---
+QUESTION_FIELDS = [f"q{i}" for i in range(1, 11)]
+RESULT_FIELDS = ["created_at", "name", "place", "age", "family_support", *QUESTION_FIELDS,
+                 "epds_score", "pred_encoded", "risk_level", "model_version"]
+ROLLUP_KEYS = ["day", "place", "age_band", "family_support", "risk_level"]
+AGE_BANDS = [(18, 24), (25, 29), (30, 34), (35, 39), (40, 45)]
+
+
+def age_band(age):
+    for lo, hi in AGE_BANDS:
+        if lo <= age <= hi:
+            return f"{lo}-{hi}"
+    return "other"
+
+
+_AGE_BAND_SQL = "CASE " + " ".join(f"WHEN age BETWEEN {lo} AND {hi} THEN '{lo}-{hi}'" for lo, hi in AGE_BANDS) \
+    + " ELSE 'other' END"
+
+RESULTS_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    name TEXT,
+    place TEXT,
+    age INTEGER,
+    family_support TEXT,
+    {", ".join(f"{q} INTEGER" for q in QUESTION_FIELDS)},
+    epds_score INTEGER,
+    pred_encoded INTEGER,
+    risk_level TEXT,
+    model_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_screenings_created_at ON screenings (created_at);
+CREATE INDEX IF NOT EXISTS idx_screenings_place ON screenings (place, created_at);
+CREATE INDEX IF NOT EXISTS idx_screenings_risk_level ON screenings (risk_level, created_at);
+
+-- Maintained incrementally by the writer, in the same transaction as the inserts.
+CREATE TABLE IF NOT EXISTS screening_rollup (
+    day TEXT NOT NULL,
+    place TEXT NOT NULL,
+    age_band TEXT NOT NULL,
+    family_support TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, place, age_band, family_support, risk_level)
+);
+"""
+
+ROLLUP_BACKFILL = f"""
+INSERT INTO screening_rollup ({", ".join(ROLLUP_KEYS)}, count)
+SELECT substr(created_at, 1, 10), place, {_AGE_BAND_SQL}, family_support, risk_level, count(*)
+FROM screenings GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+class ResultStore(SpillingStore):
+    """Append-only store of completed screenings.
+
+    The result page calls ``record``, which only enqueues; a single writer
+    thread inserts queued results and bumps the per-day rollup counts in one
+    transaction per batch, so dashboards read a table whose size depends on
+    days x places, not on the number of screenings. Rows that cannot be
+    written are spilled and replayed like feedback (see ``SpillingStore``).
+    """
+
+    fields = RESULT_FIELDS
+    kind = "screenings"
+
+    def __init__(self, path=None, spill_path=None, max_queue=10000):
+        path = path or data_path(RESULTS_DB)
+        with connect(path) as conn:
+            conn.executescript(RESULTS_SCHEMA)
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM screening_rollup)").fetchone()[0]:
+                conn.execute(ROLLUP_BACKFILL)
+        super().__init__(path, spill_path or data_path(RESULTS_SPILL), "result-store-writer", max_queue)
+
+    def record(self, name, place, age, support, q_values, score, pred_encoded, pred_label, model_version):
+        """Queues one completed screening; returns False only if it could be neither queued nor spilled."""
+        created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        return self._submit((created_at, name, place.strip(), int(age), support, *map(int, q_values),
+                             int(score), int(pred_encoded), pred_label, model_version))
+
+    def _insert(self, conn, rows):
+        rollup = Counter((row[0][:10], row[2], age_band(row[3]), row[4], row[-2]) for row in rows)
+        with conn:
+            conn.executemany(
+                f"INSERT INTO screenings ({', '.join(RESULT_FIELDS)}) "
+                f"VALUES ({', '.join('?' * len(RESULT_FIELDS))})", rows)
+            conn.executemany(
+                f"INSERT INTO screening_rollup ({', '.join(ROLLUP_KEYS)}, count) VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT ({', '.join(ROLLUP_KEYS)}) DO UPDATE SET count = count + excluded.count",
+                [(*key, n) for key, n in rollup.items()])
+
+    def load_rollup(self, since=None):
+        """Returns the rollup table as a DataFrame, optionally from a YYYY-MM-DD day on."""
+        import pandas as pd
+
+        query = f"SELECT {', '.join(ROLLUP_KEYS)}, count FROM screening_rollup"
+        params = ()
+        if since:
+            query += " WHERE day >= ?"
+            params = (since,)
+        conn = connect(self.path)
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+
+# --- Feedback ---
+FEEDBACK_FIELDS = ["created_at", "name", "email", "message"]
+
+FEEDBACK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    name TEXT,
+    email TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback (created_at);
+"""
+
+
+class FeedbackStore(SpillingStore):
+    """Durable FEEDBACK page submissions.
+
+    ``submit`` only enqueues. The writer flushes every 200 messages or 2
+    seconds; failed batches and submissions that find the queue full are
+    spilled and replayed (see ``SpillingStore``).
+    """
+
+    fields = FEEDBACK_FIELDS
+    kind = "feedback"
+
+    def __init__(self, path=None, spill_path=None, max_queue=10000):
+        path = path or data_path(FEEDBACK_DB)
+        with connect(path) as conn:
+            conn.executescript(FEEDBACK_SCHEMA)
+        super().__init__(path, spill_path or data_path(FEEDBACK_SPILL), "feedback-writer", max_queue,
+                         max_batch=200, max_delay=2.0)
+
+    def submit(self, name, email, message):
+        """Queues one submission; returns False only if it could be neither queued nor spilled."""
+        created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        return self._submit((created_at, name.strip(), email.strip(), message.strip()))
+
+    def _insert(self, conn, rows):
+        with conn:
+            conn.executemany(f"INSERT INTO feedback ({', '.join(FEEDBACK_FIELDS)}) VALUES (?, ?, ?, ?)", rows)
+
+    def export_csv(self, out):
+        """Writes all collected feedback to a CSV file or stream, oldest first."""
+        conn = connect(self.path)
+        try:
+            writer = csv.writer(out)
+            writer.writerow(FEEDBACK_FIELDS)
+            cursor = conn.execute(f"SELECT {', '.join(FEEDBACK_FIELDS)} FROM feedback ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                writer.writerows(rows)
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export data collected by the app.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export-feedback", help="Dump all feedback as CSV.")
+    export.add_argument("output", nargs="?", default="-", help="CSV file to write (default: stdout)")
+    args = parser.parse_args()
+
+    store = FeedbackStore()
+    store.writer.close()
+    if args.output == "-":
+        store.export_csv(sys.stdout)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            store.export_csv(f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+
+@pytest.fixture(scope="session")
+def pipeline_handle():
+    """The pickled pipeline and label encoder; skips when sklearn or the pickles are missing."""
+    pytest.importorskip("sklearn")
+    from model_registry import ENCODER_PATH, MODEL_PATH, ModelRegistry
+
+    model_path, encoder_path = APP_DIR / MODEL_PATH, APP_DIR / ENCODER_PATH
+    if not (os.path.exists(model_path) and os.path.exists(encoder_path)):
+        pytest.skip("model pickles not present")
+    return ModelRegistry(str(model_path), str(encoder_path), use_compiled=False).current()
@@ -0,0 +1,74 @@
+import pytest
+
+from artifact import ModelArtifact, export_artifact
+from conftest import APP_DIR
+from model_registry import ENCODER_PATH, MODEL_PATH, ModelRegistry
+from scorer import check_parity
+
+
+@pytest.fixture
+def artifact_path(pipeline_handle, tmp_path):
+    path = tmp_path / "model.ppdm"
+    export_artifact(pipeline_handle.model, pipeline_handle.le, pipeline_handle.version, str(path))
+    return path
+
+
+def _registry(tmp_path, artifact_path):
+    return ModelRegistry(str(APP_DIR / MODEL_PATH), str(APP_DIR / ENCODER_PATH), check_interval=0,
+                         bundle_path=str(tmp_path / "missing.npz"), table_path=str(tmp_path / "missing.u8"),
+                         artifact_path=str(artifact_path))
+
+
+def test_round_trip_matches_pipeline(pipeline_handle, artifact_path):
+    artifact = ModelArtifact(str(artifact_path))
+    assert artifact.version == pipeline_handle.version
+    mismatches, proba_gap = check_parity(pipeline_handle.model, artifact.scorer(), samples=5000)
+    assert mismatches == 0
+    assert proba_gap < 1e-9
+
+
+def test_checksum_mismatch_is_rejected(artifact_path):
+    data = bytearray(artifact_path.read_bytes())
+    data[-1] ^= 0xFF
+    artifact_path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        ModelArtifact(str(artifact_path))
+
+
+def test_truncated_file_is_rejected(artifact_path):
+    artifact_path.write_bytes(artifact_path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        ModelArtifact(str(artifact_path))
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "model.ppdm"
+    path.write_bytes(b"not a model artifact at all")
+    with pytest.raises(ValueError, match="not a model artifact"):
+        ModelArtifact(str(path))
+
+
+def test_stale_version_is_not_loaded(artifact_path):
+    assert ModelArtifact.load_if_current("000000000000", str(artifact_path)) is None
+    assert ModelArtifact.load_if_current("000000000000", str(artifact_path.with_suffix(".missing"))) is None
+
+
+def test_registry_picks_up_a_rebuilt_artifact(pipeline_handle, tmp_path):
+    path = tmp_path / "model.ppdm"
+    registry = _registry(tmp_path, path)
+    assert registry.current().model is not None
+
+    export_artifact(pipeline_handle.model, pipeline_handle.le, pipeline_handle.version, str(path))
+    handle = registry.current()
+    assert handle.model is None
+    assert handle.version == pipeline_handle.version
+
+
+def test_registry_falls_back_to_pickles_on_a_corrupt_artifact(pipeline_handle, tmp_path, artifact_path):
+    registry = _registry(tmp_path, artifact_path)
+    assert registry.current().model is None
+
+    artifact_path.write_bytes(artifact_path.read_bytes()[:-8])
+    handle = registry.current()
+    assert handle.model is not None
+    assert handle.version == pipeline_handle.version
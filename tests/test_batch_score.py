@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from batch_score import score_file, score_frame
+from model_registry import QUESTION_COLUMNS
+
+
+def _row(**overrides):
+    row = {"Name": "A", "Age": 30, "FamilySupport": "Medium", **{col: 1 for col in QUESTION_COLUMNS}}
+    row.update(overrides)
+    return row
+
+
+def test_invalid_rows_are_kept_unscored_with_a_reason(pipeline_handle):
+    df = pd.DataFrame([
+        _row(),
+        _row(Q3=None),
+        _row(Q4=4),
+        _row(Age=80),
+        _row(Age=29.5),
+        _row(FamilySupport="Strong"),
+        _row(FamilySupport=" low "),
+    ])
+    scored = score_frame(df, pipeline_handle.model, pipeline_handle.le)
+
+    assert list(scored["Name"]) == ["A"] * 7
+    assert scored.loc[0, "error"] == "" and scored.loc[6, "error"] == ""
+    assert "Q3 must be 0-3" in scored.loc[1, "error"]
+    assert "Q4 must be 0-3" in scored.loc[2, "error"]
+    assert "Age" in scored.loc[3, "error"] and "Age" in scored.loc[4, "error"]
+    assert "FamilySupport" in scored.loc[5, "error"]
+    assert scored["risk_level"].isna().tolist() == [False, True, True, True, True, True, False]
+    assert scored.loc[6, "FamilySupport"] == "Low"
+    assert scored.loc[0, "EPDS_Score"] == 10
+
+
+def test_valid_rows_match_the_pipeline(pipeline_handle):
+    scored = score_frame(pd.DataFrame([_row(), _row(Age=44, FamilySupport="Low", Q1=3, Q10=3)]),
+                         pipeline_handle.model, pipeline_handle.le)
+    for _, rec in scored.iterrows():
+        q_values = [int(rec[col]) for col in QUESTION_COLUMNS]
+        expected = pipeline_handle.predict(int(rec["Age"]), rec["FamilySupport"], q_values)
+        assert (rec["pred_encoded"], rec["risk_level"]) == expected
+
+
+def test_score_file_writes_only_complete_output(tmp_path, pipeline_handle):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    pd.DataFrame([_row(), _row(Q1="")] * 3).to_csv(src, index=False)
+    assert score_file(str(src), str(out), chunk_size=2, workers=1) == (6, 3)
+    assert len(pd.read_csv(out)) == 6
+    assert not (tmp_path / "out.csv.partial").exists()
+
+
+def test_missing_columns_fail_fast(pipeline_handle):
+    with pytest.raises(ValueError, match="Q10"):
+        score_frame(pd.DataFrame([_row()]).drop(columns="Q10"), pipeline_handle.model, pipeline_handle.le)
+
+
+def test_parquet_output_survives_column_types_changing_between_chunks(tmp_path, pipeline_handle):
+    pytest.importorskip("pyarrow")
+    src, out = tmp_path / "in.csv", tmp_path / "out.parquet"
+    rows = [_row(Name=None, Note=None)] * 3 + [_row(Name="Asha", Note=7)] * 3 + [_row(Name="Mira", Note="x")]
+    pd.DataFrame(rows).to_csv(src, index=False)
+    assert score_file(str(src), str(out), chunk_size=3, workers=1) == (7, 0)
+    scored = pd.read_parquet(out)
+    assert scored["Name"].isna().tolist() == [True] * 3 + [False] * 4
+    assert scored["Name"].tolist()[3:] == ["Asha"] * 3 + ["Mira"]
+    assert scored["Note"].tolist()[3:] == ["7"] * 3 + ["x"]
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from conftest import APP_DIR  # noqa: E402
+
+
+def _app():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=60)
+
+
+def test_dashboard_hidden_without_admin_password(monkeypatch):
+    monkeypatch.delenv("PPD_ADMIN_PASSWORD", raising=False)
+    at = _app().run()
+    assert "DASHBOARD" not in at.sidebar.radio[0].options
+
+
+def test_dashboard_requires_the_password(monkeypatch, tmp_path):
+    monkeypatch.setenv("PPD_ADMIN_PASSWORD", "s3cret")
+    monkeypatch.setenv("PPD_DATA_DIR", str(tmp_path))
+    at = _app().run()
+    at.sidebar.radio[0].set_value("DASHBOARD").run()
+    at.text_input[0].input("wrong").run()
+    assert not at.metric
+    at.text_input[0].input("s3cret").run()
+    assert not at.exception
+    assert any("No screenings" in info.value for info in at.info) or at.metric
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+
+import lookup_table
+from conftest import APP_DIR
+from lookup_table import (ANSWER_SPACE, N_CELLS, SUPPORT_LEVELS, RiskLookupTable, _compile_block, cell_index,
+                          header_path)
+from model_registry import ENCODER_PATH, MODEL_PATH, ModelRegistry
+
+
+def test_cell_index_layout():
+    assert cell_index(18, 0, [0] * 10) == 0
+    assert cell_index(18, 0, [0] * 9 + [1]) == 1
+    assert cell_index(18, 0, [1] + [0] * 9) == 4 ** 9
+    assert cell_index(18, 1, [0] * 10) == ANSWER_SPACE
+    assert cell_index(19, 0, [0] * 10) == len(SUPPORT_LEVELS) * ANSWER_SPACE
+    assert cell_index(45, 2, [3] * 10) == N_CELLS - 1
+
+
+def _write_header(path, handle):
+    classes = np.asarray(handle.model.classes_)
+    with open(header_path(str(path)), "w") as f:
+        json.dump({"version": handle.version, "classes": [c.item() for c in classes],
+                   "labels": [str(label) for label in handle.le.inverse_transform(classes)]}, f)
+
+
+@pytest.fixture(scope="module")
+def compiled(pipeline_handle, tmp_path_factory):
+    """A table with a few compiled blocks; the rest of the (sparse) file stays zero."""
+    path = tmp_path_factory.mktemp("lookup") / "table.u8"
+    np.memmap(path, dtype=np.uint8, mode="w+", shape=(N_CELLS,)).flush()
+    lookup_table._worker_model = pipeline_handle.model
+    classes = np.asarray(pipeline_handle.model.classes_)
+    blocks = [(29, 1, 123456, 124456), (18, 0, 0, 500), (45, 2, ANSWER_SPACE - 500, ANSWER_SPACE)]
+    try:
+        for age, support_idx, start, stop in blocks:
+            assert _compile_block((str(path), classes, age, support_idx, start, stop)) == stop - start
+    finally:
+        lookup_table._worker_model = None
+    _write_header(path, pipeline_handle)
+    return path, blocks
+
+
+def test_compiled_blocks_match_the_pipeline(pipeline_handle, compiled):
+    path, blocks = compiled
+    table = RiskLookupTable(str(path))
+    mismatches = 0
+    for age, support_idx, start, stop in blocks:
+        codes = np.arange(start, stop)
+        q_matrix = np.column_stack([(codes >> (2 * (9 - i))) & 3 for i in range(10)])
+        support = SUPPORT_LEVELS[support_idx]
+        proba = pipeline_handle.predict_proba_batch([age] * len(codes), [support] * len(codes), q_matrix.tolist())
+        expected = pipeline_handle.classes[proba.argmax(axis=1)]
+        for q_values, pred in zip(q_matrix.tolist(), expected):
+            encoded, label = table.lookup(age, support, q_values)
+            mismatches += encoded != pred
+            assert label == pipeline_handle.le.inverse_transform([encoded])[0]
+    assert mismatches == 0
+
+
+def test_lookup_rejects_inputs_outside_the_table(compiled):
+    table = RiskLookupTable(str(compiled[0]))
+    assert table.lookup(17, "High", [0] * 10) is None
+    assert table.lookup(46, "High", [0] * 10) is None
+    assert table.lookup(30, "Unknown", [0] * 10) is None
+    assert table.lookup(30, "High", [0] * 9) is None
+    assert table.lookup(30, "High", [4] + [0] * 9) is None
+
+
+def test_registry_ignores_a_truncated_table(pipeline_handle, tmp_path):
+    path = tmp_path / "table.u8"
+    path.write_bytes(b"\0" * 1000)
+    _write_header(path, pipeline_handle)
+    with pytest.raises(ValueError, match="expected"):
+        RiskLookupTable(str(path))
+
+    registry = ModelRegistry(str(APP_DIR / MODEL_PATH), str(APP_DIR / ENCODER_PATH),
+                             bundle_path=str(tmp_path / "missing.npz"), table_path=str(path),
+                             artifact_path=str(tmp_path / "missing.ppdm"))
+    handle = registry.current()
+    assert handle.lookup is None
+    assert handle.predict(29, "Low", [1] * 10) == pipeline_handle.predict(29, "Low", [1] * 10)
+
+
+def test_registry_reloads_when_only_the_header_changes(pipeline_handle, tmp_path):
+    path = tmp_path / "table.u8"
+    np.memmap(path, dtype=np.uint8, mode="w+", shape=(N_CELLS,)).flush()
+    with open(header_path(str(path)), "w") as f:
+        json.dump({"version": "stale", "classes": [], "labels": []}, f)
+    registry = ModelRegistry(str(APP_DIR / MODEL_PATH), str(APP_DIR / ENCODER_PATH), check_interval=0,
+                             bundle_path=str(tmp_path / "missing.npz"), table_path=str(path),
+                             artifact_path=str(tmp_path / "missing.ppdm"))
+    assert registry.current().lookup is None
+
+    _write_header(path, pipeline_handle)
+    assert registry.current().lookup is not None
@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from conftest import APP_DIR  # noqa: E402
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+@pytest.mark.parametrize("mode", ["fragment", "classic"])
+def test_questionnaire_reaches_result(monkeypatch, tmp_path, pipeline_handle, mode):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    fragments = []
+    real_fragment = st.fragment
+
+    def spy(func=None, **kwargs):
+        fragments.append(func)
+        return real_fragment(func, **kwargs) if func is not None else real_fragment(**kwargs)
+
+    monkeypatch.setattr(st, "fragment", spy)
+    monkeypatch.setenv("PPD_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("PPD_QUESTIONNAIRE_MODE", mode)
+    at = AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=60).run()
+    at.sidebar.radio[0].set_value("TAKE TEST").run()
+    at.text_input[0].input("Asha")
+    at.text_input[1].input("Kochi")
+    _button(at, "Start Questionnaire").click().run()
+
+    answers = []
+    for q in range(1, 11):
+        radio = at.radio(key=f"q{q}")
+        radio.set_value(radio.options[q % 4])
+        answers.append(q % 4)
+        _button(at, "Next ➡️").click().run()
+        assert not at.exception
+        if q == 3:
+            _button(at, "⬅️ Back").click().run()
+            assert at.session_state["question_index"] == 3
+            at.radio(key="q3").set_value(at.radio(key="q3").options[3])
+            _button(at, "Next ➡️").click().run()
+
+    assert at.session_state["responses"] == answers
+    steps = [func for func in fragments if getattr(func, "__name__", "") == "questionnaire_step"]
+    assert bool(steps) == (mode == "fragment")
+    _, expected = pipeline_handle.predict(25, "Medium", answers)
+    assert any(expected in s.value for s in at.success)
@@ -0,0 +1,46 @@
+import io
+import math
+import zipfile
+
+import pytest
+
+pytest.importorskip("fpdf")
+
+from report import export_reports_zip, pdf_text, render_report_pdf  # noqa: E402
+
+
+def _record(**overrides):
+    rec = {"Name": "Asha", "Place": "Kochi", "Age": 29.0, "FamilySupport": "Low", "EPDS_Score": 12,
+           "risk_level": "Moderate"}
+    rec.update(overrides)
+    return rec
+
+
+def test_render_report_pdf_returns_pdf_bytes():
+    assert render_report_pdf("Asha", "Kochi", 29, "Low", 12, "Moderate").startswith(b"%PDF")
+
+
+def test_bad_records_are_skipped_and_reported():
+    records = [
+        _record(),
+        _record(Name="Ἀθηνᾶ"),
+        _record(risk_level=float("nan")),
+        {"Name": "NoAge", "FamilySupport": "Low", "EPDS_Score": 3, "risk_level": "Mild"},
+        _record(Name=math.nan, Place=None),
+    ]
+    out = io.BytesIO()
+    written, failures, _ = export_reports_zip(records, out, workers=1, batch_size=2)
+
+    assert written == 2
+    assert [index for index, _ in failures] == [2, 3, 4]
+    assert "risk_level" in failures[1][1] and "Age" in failures[2][1]
+    names = zipfile.ZipFile(out).namelist()
+    assert names == ["000001_Asha_PPD_Result.pdf", "000005_PPD_PPD_Result.pdf"]
+
+
+def test_pdf_text_keeps_latin1_and_replaces_the_rest():
+    assert pdf_text("Zoë, Kochi") == "Zoë, Kochi"
+    assert pdf_text("Łódź") == "?ódz"
+    assert pdf_text("Ἀθηνᾶ") == "?????"
+    assert pdf_text("ആശ") == "??"
+    assert render_report_pdf(pdf_text("ആശ"), pdf_text("കൊച്ചി"), 29, "Low", 12, "Moderate").startswith(b"%PDF")
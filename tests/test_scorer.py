@@ -0,0 +1,43 @@
+import copy
+
+import numpy as np
+import pytest
+
+from model_registry import build_input_frame
+from scorer import CompiledScorer, bundle_arrays, check_parity
+
+
+@pytest.fixture(scope="module")
+def scorer(pipeline_handle):
+    return CompiledScorer(bundle_arrays(pipeline_handle.model, pipeline_handle.le, pipeline_handle.version))
+
+
+def test_batch_matches_pipeline(pipeline_handle, scorer):
+    mismatches, proba_gap = check_parity(pipeline_handle.model, scorer, samples=5000)
+    assert mismatches == 0
+    assert proba_gap < 1e-9
+
+
+def test_single_prediction_matches_pipeline(pipeline_handle, scorer):
+    cases = [(18, "High", [0] * 10), (45, "Low", [3] * 10), (29, "Medium", [1, 2, 0, 3, 1, 2, 0, 3, 1, 1])]
+    for age, support, q_values in cases:
+        pred_encoded = pipeline_handle.model.predict(build_input_frame(age, support, q_values))[0]
+        pred_label = pipeline_handle.le.inverse_transform([pred_encoded])[0]
+        assert scorer.predict(age, support, q_values) == (pred_encoded, pred_label)
+
+
+def test_unknown_support_matches_ignored_category(pipeline_handle, scorer):
+    expected = pipeline_handle.model.predict_proba(build_input_frame(30, "Unknown", [2] * 10))
+    np.testing.assert_allclose(scorer.predict_proba_batch([30], ["Unknown"], [[2] * 10]), expected, atol=1e-9)
+
+
+def test_labels_follow_model_classes(pipeline_handle, scorer):
+    assert scorer.labels == pipeline_handle.labels
+
+
+@pytest.mark.parametrize("attr, value", [("drop", "first"), ("handle_unknown", "error")])
+def test_unsupported_encoder_settings_are_rejected(pipeline_handle, attr, value):
+    model = copy.deepcopy(pipeline_handle.model)
+    setattr(model.named_steps["preprocessing"].named_transformers_["cat"], attr, value)
+    with pytest.raises(ValueError, match="FamilySupport encoding"):
+        bundle_arrays(model, pipeline_handle.le, pipeline_handle.version)
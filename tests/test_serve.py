@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from serve import LocalServer, validate_row
+
+VALID = {"Age": 29, "FamilySupport": "Low", **{f"Q{i}": 1 for i in range(1, 11)}}
+
+
+def _request(url, path, payload=None):
+    """Returns (status, headers, JSON body); POSTs when there is a payload."""
+    data = None if payload is None else json.dumps(payload).encode()
+    request = urllib.request.Request(url + path, data=data, method="GET" if data is None else "POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.headers, json.loads(exc.read())
+
+
+def _post(url, payload):
+    status, _, body = _request(url, "/predict", payload)
+    return status, body
+
+
+@pytest.mark.parametrize("change", [
+    {"Age": 80}, {"Age": 17}, {"Age": 29.0}, {"Age": True},
+    {"Q3": 2.0}, {"Q3": 4}, {"Q3": -1}, {"Q3": False}, {"Q3": None},
+    {"FamilySupport": "low"},
+])
+def test_validate_row_rejects(change):
+    with pytest.raises(ValueError):
+        validate_row({**VALID, **change})
+
+
+def test_validate_row_accepts_bounds():
+    assert validate_row({**VALID, "Age": 18})["Age"] == 18
+    assert validate_row({**VALID, "Age": 45, "Q1": 3, "Q2": 0})["Q1"] == 3
+
+
+def test_predict_matches_handle(pipeline_handle):
+    class Registry:
+        def current(self):
+            return pipeline_handle
+
+    with LocalServer(registry=Registry()) as url:
+        status, body = _post(url, VALID)
+    assert status == 200
+    assert (body["pred_encoded"], body["risk_level"]) == tuple(pipeline_handle.predict(29, "Low", [1] * 10))
+    assert body["EPDS_Score"] == 10
+
+
+def test_scoring_error_returns_500():
+    class BrokenRegistry:
+        def current(self):
+            raise RuntimeError("model unavailable")
+
+    with LocalServer(registry=BrokenRegistry()) as url:
+        status, body = _post(url, VALID)
+    assert status == 500
+    assert body == {"error": "internal error"}
+
+
+def test_health_check_reports_a_broken_model():
+    class BrokenRegistry:
+        def current(self):
+            raise RuntimeError("model unavailable")
+
+    with LocalServer(registry=BrokenRegistry()) as url:
+        status, _, body = _request(url, "/healthz")
+    assert status == 503
+    assert body == {"status": "unavailable"}
+
+
+def test_concurrent_requests_are_scored_in_batches(pipeline_handle):
+    class SlowRegistry:
+        def current(self):
+            time.sleep(0.05)  # requests arriving meanwhile queue up for the next batch
+            return pipeline_handle
+
+    with LocalServer(registry=SlowRegistry(), max_wait_ms=20) as url:
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(lambda _: _post(url, VALID), range(48)))
+        _, _, stats = _request(url, "/stats")
+    assert [status for status, _ in results] == [200] * 48
+    assert stats["samples"] == 48
+    assert stats["mean_batch_size"] > 1
+
+
+def test_full_queue_returns_503_with_retry_after(pipeline_handle):
+    release = threading.Event()
+
+    class BlockedRegistry:
+        def current(self):
+            release.wait(10)
+            return pipeline_handle
+
+    with LocalServer(registry=BlockedRegistry(), max_batch=1, max_queue=1) as url:
+        with ThreadPoolExecutor(6) as pool:
+            pending = [pool.submit(_request, url, "/predict", VALID) for _ in range(6)]
+            # One request is being scored and one fills the queue; the other four are turned away at once.
+            deadline = time.monotonic() + 10
+            while sum(future.done() for future in pending) < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            early = [future.result() for future in pending if future.done()]
+            release.set()
+            results = [future.result() for future in pending]
+        _, _, stats = _request(url, "/stats")
+    assert [status for status, _, _ in early] == [503] * 4
+    assert all(headers["Retry-After"] == "1" for _, headers, _ in early)
+    assert sorted(status for status, _, _ in results) == [200, 200, 503, 503, 503, 503]
+    assert stats["rejected"] == 4
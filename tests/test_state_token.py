@@ -0,0 +1,78 @@
+import base64
+import subprocess
+import sys
+import time
+
+from conftest import APP_DIR
+from state_token import MAX_TOKEN_CHARS, decode_state, encode_state
+
+SECRET = b"test-secret"
+PROGRESS = {"question_index": 4, "responses": [3, 0, 2], "age": 29, "support": "Low", "name": "Asha",
+            "place": "Kochi"}
+
+
+def _token(**overrides):
+    progress = {**PROGRESS, **overrides}
+    return encode_state(*progress.values(), SECRET)
+
+
+def _raw(token):
+    return bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+
+def _text(raw):
+    return base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+
+
+def test_round_trip():
+    assert decode_state(_token(), SECRET) == PROGRESS
+    finished = {**PROGRESS, "question_index": 11, "responses": [3] * 10}
+    assert decode_state(encode_state(*finished.values(), SECRET), SECRET) == finished
+
+
+def test_name_and_place_are_not_readable():
+    raw = bytes(_raw(_token()))
+    assert b"Asha" not in raw and b"Kochi" not in raw
+
+
+def test_tampered_token_is_rejected():
+    token = _token()
+    for i in range(len(_raw(token))):
+        raw = _raw(token)
+        raw[i] ^= 0x01
+        assert decode_state(_text(raw), SECRET) is None
+
+
+def test_wrong_secret_is_rejected():
+    assert decode_state(_token(), b"other-secret") is None
+
+
+def test_expired_token_is_rejected():
+    old = encode_state(*PROGRESS.values(), SECRET, issued_at=time.time() - 3600)
+    assert decode_state(old, SECRET, max_age=60) is None
+    assert decode_state(old, SECRET) == PROGRESS
+    future = encode_state(*PROGRESS.values(), SECRET, issued_at=time.time() + 3600)
+    assert decode_state(future, SECRET) is None
+
+
+def test_truncated_token_is_rejected():
+    token = _token()
+    for end in (0, 1, 10, len(token) // 2, len(token) - 1):
+        assert decode_state(token[:end], SECRET) is None
+
+
+def test_oversize_token_is_rejected():
+    longest = _token(name="x" * 1000, place="y" * 1000)
+    assert len(longest) <= MAX_TOKEN_CHARS
+    assert decode_state(longest, SECRET)["name"] == "x" * 255
+    assert decode_state("A" * (MAX_TOKEN_CHARS + 1), SECRET) is None
+
+
+def test_garbage_is_rejected():
+    for token in ("", "!!!!", "not a token", "A" * 40):
+        assert decode_state(token, SECRET) is None
+
+
+def test_app_shell_does_not_import_cryptography():
+    code = "import sys, views.resume; sys.exit('cryptography' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=APP_DIR).returncode == 0
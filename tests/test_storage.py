@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import os
+import multiprocessing
+
+from storage import FEEDBACK_FIELDS, RESULTS_SCHEMA, FeedbackStore, ResultStore
+
+
+def _spill(path, *names):
+    with open(path, "w", encoding="utf-8") as f:
+        for name in names:
+            f.write(json.dumps(dict(zip(FEEDBACK_FIELDS, ["2025-01-01T00:00:00+00:00", name, "", "hi"]))) + "\n")
+
+
+def _names(store):
+    with sqlite3.connect(store.path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM feedback"))
+
+
+def test_spill_replay_then_writer_thread_flushes(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    _spill(spill, "a", "b")
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.retry_delays = ()  # a failed first flush would now spill instead of being retried
+    store.submit("c", "", "hello")
+    store.writer.close()
+    assert _names(store) == ["a", "b", "c"]
+    assert not os.path.exists(spill) and not list(tmp_path.glob("spill.jsonl.replay*"))
+
+
+def test_dead_process_claims_are_replayed_live_ones_are_not(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    _spill(f"{spill}.replay.999999999-0", "orphan")
+    _spill(f"{spill}.replay.1-0", "in-progress")  # pid 1 is always alive
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.writer.close()
+    assert _names(store) == ["orphan"]
+    assert os.path.exists(f"{spill}.replay.1-0")
+
+
+def _start_store(db, spill, barrier):
+    barrier.wait()
+    FeedbackStore(db, spill).writer.close()
+
+
+def test_concurrent_process_starts_replay_each_row_once(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    _spill(spill, *[f"n{i}" for i in range(50)])
+    db = str(tmp_path / "feedback.db")
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(4)
+    procs = [ctx.Process(target=_start_store, args=(db, str(spill), barrier)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+    assert [proc.exitcode for proc in procs] == [0] * 4
+    store = FeedbackStore(db, str(spill))
+    store.writer.close()
+    assert _names(store) == sorted(f"n{i}" for i in range(50))
+
+
+def test_torn_spill_line_is_quarantined_and_store_starts(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    _spill(spill, "whole")
+    with open(spill, "a", encoding="utf-8") as f:
+        f.write('{"created_at": "2025-01-01T00:00:00+00:00", "na')
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.writer.close()
+    assert _names(store) == ["whole"]
+    assert not list(tmp_path.glob("spill.jsonl.replay*"))
+    assert (tmp_path / "spill.jsonl.bad").read_text(encoding="utf-8").startswith('{"created_at"')
+
+
+def test_spill_after_torn_line_starts_on_a_new_line(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.writer.close()
+    spill.write_text('{"created_at": "2025', encoding="utf-8")
+    store._spill([("2025-01-01T00:00:00+00:00", "after", "", "hi")])
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.writer.close()
+    assert _names(store) == ["after"]
+
+
+def test_full_queue_spills_instead_of_dropping(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill), max_queue=1)
+    store.writer.close()  # nothing drains the queue from here on
+    assert all(store.submit(f"n{i}", "", "hi") for i in range(3))
+    assert len(spill.read_text(encoding="utf-8").splitlines()) == 2
+    store = FeedbackStore(str(tmp_path / "feedback.db"), str(spill))
+    store.writer.close()
+    assert _names(store) == ["n1", "n2"]
+
+
+def _record(store, name, place="Kochi", age=29, support="Low", risk="Mild"):
+    return store.record(name, place, age, support, [1] * 10, 10, 1, risk, "v1")
+
+
+def _rollup(store):
+    with sqlite3.connect(store.path) as conn:
+        return sorted(conn.execute("SELECT place, age_band, family_support, risk_level, count FROM screening_rollup"))
+
+
+def _screenings(store):
+    with sqlite3.connect(store.path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM screenings"))
+
+
+def test_results_are_inserted_with_their_rollup(tmp_path):
+    store = ResultStore(str(tmp_path / "screenings.db"), str(tmp_path / "spill.jsonl"))
+    assert _record(store, "a") and _record(store, "b") and _record(store, "c", place=" Pune ", age=40)
+    store.writer.close()
+    assert _screenings(store) == ["a", "b", "c"]
+    assert _rollup(store) == [("Kochi", "25-29", "Low", "Mild", 2), ("Pune", "40-45", "Low", "Mild", 1)]
+
+
+def test_rollup_counts_accumulate_across_batches_and_restarts(tmp_path):
+    db = str(tmp_path / "screenings.db")
+    for name in ("a", "b"):
+        store = ResultStore(db, str(tmp_path / "spill.jsonl"))
+        _record(store, name)
+        store.writer.close()
+    assert _rollup(store) == [("Kochi", "25-29", "Low", "Mild", 2)]
+
+
+def test_rollup_is_backfilled_from_existing_screenings(tmp_path):
+    db = tmp_path / "screenings.db"
+    with sqlite3.connect(db) as conn:
+        conn.executescript(RESULTS_SCHEMA)
+        conn.executemany("INSERT INTO screenings (created_at, name, place, age, family_support, risk_level) "
+                         "VALUES (?, ?, ?, ?, ?, ?)",
+                         [("2025-01-01T09:00:00+00:00", "a", "Kochi", 19, "High", "Minimal"),
+                          ("2025-01-01T10:00:00+00:00", "b", "Kochi", 24, "High", "Minimal"),
+                          ("2025-01-02T10:00:00+00:00", "c", "Kochi", 50, "High", "Severe")])
+    store = ResultStore(str(db), str(tmp_path / "spill.jsonl"))
+    store.writer.close()
+    with sqlite3.connect(db) as conn:
+        assert sorted(conn.execute("SELECT day, age_band, risk_level, count FROM screening_rollup")) == [
+            ("2025-01-01", "18-24", "Minimal", 2), ("2025-01-02", "other", "Severe", 1)]
+
+
+def test_failed_result_batch_is_spilled_and_replayed(tmp_path):
+    db, spill = str(tmp_path / "screenings.db"), tmp_path / "spill.jsonl"
+    store = ResultStore(db, str(spill))
+    store.retry_delays = ()
+
+    def locked(conn, rows):
+        raise sqlite3.OperationalError("database is locked")
+
+    store._insert = locked
+    _record(store, "a")
+    _record(store, "b")
+    store.writer.close()
+    assert _screenings(store) == []
+    assert len(spill.read_text(encoding="utf-8").splitlines()) == 2
+
+    store = ResultStore(db, str(spill))
+    store.writer.close()
+    assert _screenings(store) == ["a", "b"]
+    assert _rollup(store) == [("Kochi", "25-29", "Low", "Mild", 2)]
+    assert not os.path.exists(spill)
+
+
+def test_full_result_queue_spills_instead_of_dropping(tmp_path):
+    db, spill = str(tmp_path / "screenings.db"), tmp_path / "spill.jsonl"
+    store = ResultStore(db, str(spill), max_queue=1)
+    store.writer.close()  # nothing drains the queue from here on
+    assert _record(store, "queued") and _record(store, "spilled")
+    store = ResultStore(db, str(spill))
+    store.writer.close()
+    assert _screenings(store) == ["spilled"]
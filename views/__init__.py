@@ -0,0 +1,2 @@
+"""Sidebar pages. Each module exposes ``render()`` and is imported only when
+its page is first opened."""
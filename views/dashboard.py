@@ -0,0 +1,39 @@
+import hmac
+import os
+
+import streamlit as st
+
+from services import RISK_ORDER, load_dashboard_rollup
+
+
+def render():
+    st.header("SCREENING DASHBOARD")
+    # Closed unless an admin password is configured: small cells can identify a real mother's result.
+    admin_password = os.environ.get("PPD_ADMIN_PASSWORD")
+    if not admin_password:
+        st.info("The dashboard is disabled. Set PPD_ADMIN_PASSWORD to enable it.")
+        return
+    entered = st.text_input("Admin password", type="password")
+    if not hmac.compare_digest(entered.encode(), admin_password.encode()):
+        st.info("Enter the admin password to view screening statistics.")
+        return
+
+    period = st.selectbox("Period", ["Last 30 days", "Last 90 days", "Last 365 days", "All time"])
+    days = {"Last 30 days": 30, "Last 90 days": 90, "Last 365 days": 365}.get(period)
+    rollup = load_dashboard_rollup(days)
+
+    if rollup.empty:
+        st.info("No screenings recorded yet.")
+    else:
+        risk_order = [level for level in RISK_ORDER if level in set(rollup["risk_level"])]
+        st.metric("Screenings", f"{int(rollup['count'].sum()):,}")
+
+        st.subheader("Risk levels over time")
+        st.line_chart(rollup.pivot_table(index="day", columns="risk_level", values="count",
+                                         aggfunc="sum", fill_value=0)[risk_order])
+
+        for title, dim in [("By place", "place"), ("By age band", "age_band"), ("By family support", "family_support")]:
+            st.subheader(title)
+            by_dim = rollup.pivot_table(index=dim, columns="risk_level", values="count", aggfunc="sum", fill_value=0)
+            by_dim = by_dim.loc[by_dim.sum(axis=1).sort_values(ascending=False).index[:20], risk_order]
+            st.bar_chart(by_dim)
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from services import get_feedback_store
+
+
+def render():
+    st.markdown("<h2 style='color: #f06292;'>SHARE YOUR FEEDBACK</h2>", unsafe_allow_html=True)
+    st.markdown("<p style='color: #ddd;'>We value your input and would love to hear your thoughts or suggestions!</p>", unsafe_allow_html=True)
+
+    with st.form("feedback_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("Your Name")
+        with col2:
+            email = st.text_input("Your Email (optional)")
+
+        message = st.text_area("Your Feedback", height=150)
+
+        submitted = st.form_submit_button("SUBMIT FEEDBACK")
+
+        if submitted:
+            if message.strip() and not get_feedback_store().submit(name, email, message):
+                st.error("Sorry, we couldn't save your feedback right now. Please try again in a moment.")
+            else:
+                st.success("Thank you for your valuable feedback! 💌")
+                st.balloons()
@@ -0,0 +1,14 @@
+import streamlit as st
+
+
+def render():
+    st.markdown("""
+    <div style="text-align: center; padding: 40px 20px;">
+        <h1 style="font-size: 3.5em; color: white;">POSTPARTUM DEPRESSION RISK PREDICTOR</h1>
+        <h3 style="font-size: 1.6em; color: white;">Empowering maternal health through smart technology</h3>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("START TEST"):
+        st.session_state.nav_to = "TAKE TEST"
+        st.rerun()
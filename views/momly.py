@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import streamlit as st
+
+from metrics import span
+from services import get_content
+
+
+# --- MOMLY Comfort Content ---
+@st.cache_data
+def momly_details_markdown(content_version, feeling):
+    """Pre-renders the tips and activity lists for one feeling."""
+    content = get_content().momly_support[feeling]
+    tips_md = "\n".join(f"- **Tip {i}:** {tip}" for i, tip in enumerate(content["tips"], 1))
+    activity_md = "\n\n".join(f"🔹 {step}" for step in content["activity"])
+    return tips_md, activity_md
+
+
+# --- Load avatar image ---
+@st.cache_resource
+def avatar_available():
+    """Checked once per process instead of decoding the PNG on every rerun."""
+    return Path("momly_avatar.png").exists()
+
+
+def show_avatar_button():
+    if not avatar_available():
+        st.warning("Avatar image 'momly_avatar.png' not found.")
+        return
+
+    st.markdown("""
+        <style>
+        .avatar-container {
+            position: fixed;
+            bottom: 20px;
+            right: 20px;
+            z-index: 9999;
+        }
+        </style>
+        <div class="avatar-container">
+        """, unsafe_allow_html=True)
+
+    avatar_col1, avatar_col2, avatar_col3 = st.columns([8, 1, 1])
+    with avatar_col3:
+        if st.button("💬", help="Click to chat with MOMLY"):
+            st.session_state.show_chat = not st.session_state.show_chat
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# --- MOMLY Chat Display ---
+# Button callbacks run before the rerun the click triggers, whether that is a
+# fragment or a full rerun, so the chat never needs an explicit st.rerun.
+def show_details():
+    st.session_state['show_momly_details'] = True
+
+
+def reset_chat():
+    st.session_state['show_chat'] = False
+    st.session_state['show_momly_details'] = False
+    st.session_state.pop('feeling_radio', None)
+
+
+
+# Runs as a fragment: the avatar toggle and every chat click rerun only this
+# function, not the page, the model or the result screen.
+@st.fragment
+def momly_chat():
+    with span("chat_render"):
+        render_chat()
+
+
+def render_chat():
+    show_avatar_button()
+
+    if not st.session_state['show_chat']:
+        return
+
+    bundle = get_content()
+    momly_support = bundle.momly_support
+    with st.expander("💬 MOMLY is here for you", expanded=True):
+        st.write("Hi! I'm MOMLY, your support buddy. How are you feeling today?")
+
+        feeling = st.radio("Choose your feeling:", list(momly_support.keys()), horizontal=True, key="feeling_radio")
+
+        if feeling:
+            content = momly_support[feeling]
+            st.success(content["message"])
+
+            st.button("🎗️ Show me what to do", on_click=show_details)
+
+            if st.session_state['show_momly_details']:
+                tips_md, activity_md = momly_details_markdown(bundle.version, feeling)
+                st.subheader("🌱 TIPS")
+                st.markdown(tips_md)
+
+                st.subheader("🧩 TRY THIS ACTIVITY")
+                st.markdown(activity_md)
+
+                st.subheader("🎥 RECOMMENDED VIDEO")
+                st.video(content["video"])
+
+                st.subheader("🎯 MIND DISTRACTION")
+                st.info(content["distraction"])
+
+        st.button("🔄 Reset Chat", on_click=reset_chat)
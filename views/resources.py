@@ -0,0 +1,17 @@
+import streamlit as st
+
+from services import get_content
+
+
+def render():
+    st.markdown("<h2 style='color: #f06292;'>HELPFUL LINKS AND SUPPORT</h2>", unsafe_allow_html=True)
+    st.markdown("<p style='color: #ccc;'>Here are some trusted resources for maternal mental health support and crisis assistance.</p>", unsafe_allow_html=True)
+
+    for res in get_content().resources:
+        st.markdown(f"""
+            <div style="background: #333; border-radius: 10px; padding: 15px; margin-bottom: 15px;">
+                <h4 style="margin-bottom: 5px;'>{res['name']}</h4>
+                <p style="color: #bbb;">{res['desc']}</p>
+                <a href="{res['link']}" target="_blank" style="color: #f06292; text-decoration: none;">🔗 Visit Site</a>
+            </div>
+        """, unsafe_allow_html=True)
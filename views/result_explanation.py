@@ -0,0 +1,14 @@
+import streamlit as st
+
+
+def render():
+    st.header("UNDERSTANDING RISK LEVELS")
+    st.info("All assessments in this app are based on the EPDS (Edinburgh Postnatal Depression Scale), a trusted and validated 10-question tool used worldwide to screen for postpartum depression.")
+    st.markdown("""
+    | Risk Level | Meaning |
+    |------------|---------|
+    | **Mild (0)** | Normal ups and downs |
+    | **Moderate (1)** | Requires monitoring |
+    | **Severe (2)** | Suggests possible clinical depression |
+    | **Profound (3)** | Needs professional help urgently |
+    """)
@@ -0,0 +1,57 @@
+import os
+
+import streamlit as st
+
+# Questionnaire progress kept in the encrypted ?resume= query param when
+# PPD_STATE_SECRET is set, so any replica can pick up any assessment.
+# state_token (and cryptography with it) is only imported once a secret is set.
+PARAM = "resume"
+PROGRESS_KEYS = ["question_index", "responses", "age", "support", "name", "place"]
+
+
+def state_secret():
+    """The shared secret, or None when URL state is disabled."""
+    secret = os.environ.get("PPD_STATE_SECRET")
+    return secret.encode() if secret else None
+
+
+def restore_progress():
+    """Loads progress from the URL into a session that has not seen this token yet.
+
+    Returns False if the link was present but forged, stale or malformed.
+    """
+    secret = state_secret()
+    token = st.query_params.get(PARAM)
+    if not secret or not token or st.session_state.get("resume_token") == token:
+        return True
+
+    from state_token import decode_state
+    state = decode_state(token, secret)
+    if state is None:
+        del st.query_params[PARAM]
+        return False
+    st.session_state.update(state)
+    st.session_state.resume_token = token
+    st.session_state.nav_to = "TAKE TEST"
+    if state["question_index"] == 11:
+        # The result was recorded when it was first shown; don't count it again on resume.
+        st.session_state.recorded_key = (state["name"], state["place"], state["age"], state["support"],
+                                         tuple(state["responses"]))
+    return True
+
+
+def save_progress():
+    """Mirrors the current questionnaire progress into the URL."""
+    secret = state_secret()
+    if not secret:
+        return
+    from state_token import encode_state
+    token = encode_state(*(st.session_state[key] for key in PROGRESS_KEYS), secret)
+    st.session_state.resume_token = token
+    st.query_params[PARAM] = token
+
+
+def clear_progress():
+    st.session_state.pop("resume_token", None)
+    if PARAM in st.query_params:
+        del st.query_params[PARAM]
@@ -0,0 +1,177 @@
+import os
+
+import streamlit as st
+
+from content import AGE_MAX, AGE_MIN, SUPPORT_LEVELS
+from metrics import count, span
+from services import explain_result, get_content, get_model_registry, get_result_store, predict_risk, prewarm_model
+from views.resume import clear_progress, save_progress
+
+
+def questionnaire_mode():
+    """PPD_QUESTIONNAIRE_MODE, read per render since the module outlives changes to it.
+
+    "fragment" (default) pages through the questions with partial reruns;
+    "classic" reruns the whole script on every Back/Next.
+    """
+    return os.environ.get("PPD_QUESTIONNAIRE_MODE", "fragment")
+
+
+def go_back():
+    if st.session_state.question_index > 1:
+        st.session_state.question_index -= 1
+        st.session_state.responses.pop()
+        save_progress()
+
+
+def go_next(options):
+    idx = st.session_state.question_index
+    st.session_state.responses.append(options[st.session_state[f"q{idx}"]])
+    st.session_state.question_index += 1
+    save_progress()
+
+
+def render():
+    st.header("QUESTIONNAIRE")
+    # The model is only needed on the result screen; load it while the questions are answered.
+    prewarm_model()
+
+    for var, default in {
+        'question_index': 0,
+        'responses': [],
+        'age': 25,
+        'support': "Medium",
+        'name': "",
+        'place': ""
+    }.items():
+        if var not in st.session_state:
+            st.session_state[var] = default
+
+    idx = st.session_state.question_index
+
+    if idx == 0:
+        st.session_state.name = st.text_input("First Name", value=st.session_state.name)
+        st.session_state.place = st.text_input("Your Place", value=st.session_state.place)
+        st.session_state.age = st.slider("Your Age", AGE_MIN, AGE_MAX, value=st.session_state.age)
+        st.session_state.support = st.selectbox("Level of Family Support", SUPPORT_LEVELS,
+                                                index=SUPPORT_LEVELS.index(st.session_state.support))
+        if st.button("Start Questionnaire"):
+            if st.session_state.name.strip() and st.session_state.place.strip():
+                st.session_state.question_index += 1
+                save_progress()
+                st.rerun()
+            else:
+                st.warning("Please enter your name and place before starting.")
+
+    q_responses = get_content().questions
+
+    def questionnaire_step():
+        idx = st.session_state.question_index
+        if not 1 <= idx <= 10:
+            # Next on question 10 ran as a fragment rerun; the result screen needs the whole page.
+            st.rerun()
+        st.progress((idx - 1) / 10, text=f"Question {idx} of 10") # The Scaler/Progress bar
+        q_text, options = q_responses[idx - 1]
+        
+        # Centering the question and options
+        st.markdown("<div class='centered-question'>", unsafe_allow_html=True)
+        st.radio(f"{idx}. {q_text}", list(options.keys()), key=f"q{idx}")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        # Callbacks update the state before the rerun the click triggers, so no
+        # explicit st.rerun is needed (a scoped one fails outside fragment reruns).
+        col1, col2 = st.columns(2)
+        col1.button("⬅️ Back", on_click=go_back)
+        col2.button("Next ➡️", on_click=go_next, args=(options,))
+
+    if 1 <= idx <= 10:
+        if questionnaire_mode() == "fragment":
+            # Back/Next rerun only the question block, not the whole page.
+            st.fragment(questionnaire_step)()
+        else:
+            questionnaire_step()
+
+    elif idx == 11:
+        st.progress(1.0, text="Questionnaire Complete!") # The Scaler/Progress bar
+        name = st.session_state.name
+        place = st.session_state.place
+        age = st.session_state.age
+        support = st.session_state.support
+        q_values = st.session_state.responses
+        score = sum(q_values)
+
+        from figures import get_figure
+        from report import pdf_text, render_report_pdf, report_filename
+
+        try:
+            model_handle = get_model_registry().current()
+        except FileNotFoundError:
+            st.error("Error: Model files 'ppd_model_pipeline.pkl' or 'label_encoder.pkl' not found. Please ensure they are in the same directory.")
+            st.stop()
+
+        pred_encoded, pred_label = predict_risk(model_handle.version, age, support, tuple(q_values))
+
+        # Saved once per completed assessment; the write happens off the rerun thread.
+        # If it could not even be spilled, the next rerun tries again.
+        result_key = (name, place, age, support, tuple(q_values))
+        if st.session_state.get('recorded_key') != result_key:
+            if get_result_store().record(name, place, age, support, q_values, score, pred_encoded, pred_label,
+                                         model_handle.version):
+                count("ppd_screenings_total", risk_level=pred_label)
+                st.session_state.recorded_key = result_key
+            else:
+                count("ppd_screenings_unsaved_total")
+
+        st.success(f"{name}, your predicted PPD Risk is: **{pred_label}**")
+        st.markdown("<p style='color:#ccc; font-style:italic;'>Note: This screening result is generated based on the EPDS – Edinburgh Postnatal Depression Scale, a globally validated tool for postpartum depression assessment.</p>", unsafe_allow_html=True)
+
+        # Only four possible gauges; built once per process and shared.
+        with span("gauge_render"):
+            fig = get_figure("risk_gauge", int(pred_encoded), "default")
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("💡 PERSONALIZED TIPS")
+        st.markdown(get_content().tips.get(pred_label, "Consult a professional immediately."))
+
+        with st.expander("🔍 What drove this result?"):
+            _, what_if = explain_result(model_handle.version, age, support, tuple(q_values))
+            answer_text = get_content().answer_labels
+            explanation = []
+            for row in sorted(what_if, key=lambda r: (not r["changes_result"], -abs(r["delta_p"]))):
+                if row["feature"] == "FamilySupport":
+                    question, current, alternative = "Family support", row["current"], row["alternative"]
+                else:
+                    q = int(row["feature"][1:])
+                    question = f"{q}. {q_responses[q - 1][0]}"
+                    current, alternative = answer_text[q - 1][row["current"]], answer_text[q - 1][row["alternative"]]
+                explanation.append({
+                    "Question": question,
+                    "Your answer": current,
+                    "If instead": alternative,
+                    "Predicted risk": row["risk_level"],
+                    f"Change in P({pred_label})": f"{row['delta_p']:+.1%}",
+                })
+            st.caption("How the prediction would change if a single answer were different.")
+            st.dataframe(explanation, use_container_width=True, hide_index=True)
+
+        # Rendered in memory only when asked for, and kept per session for these answers.
+        report_key = (name, place, age, support, tuple(q_values), pred_label)
+        if st.session_state.get('report_key') == report_key:
+            st.download_button("📥 Download Result (PDF)", data=st.session_state.report_pdf,
+                               file_name=report_filename(name), mime="application/pdf")
+            if pdf_text(name) != name or pdf_text(place) != place:
+                st.caption("Some letters of your name or place cannot be shown in the PDF and appear as '?'.")
+        elif st.button("📄 Prepare PDF Report"):
+            with span("pdf_render"):
+                # The PDF fonts only cover Latin-1; anything else would raise UnicodeEncodeError.
+                st.session_state.report_pdf = render_report_pdf(pdf_text(name), pdf_text(place), age, support,
+                                                                score, pred_label)
+            st.session_state.report_key = report_key
+            st.rerun()
+
+        if st.button("🔄 Restart"):
+            for key in ['question_index', 'responses', 'age', 'support', 'name', 'place', 'report_key', 'report_pdf',
+                        'recorded_key']:
+                st.session_state.pop(key, None)
+            clear_progress()
+            st.rerun()